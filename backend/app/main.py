@@ -1,12 +1,15 @@
 from __future__ import annotations
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, File, UploadFile, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
-from typing import Optional, List, Dict
+from typing import AsyncIterator, Optional, List, Dict
 from pathlib import Path
+import os
 import uvicorn
 
-from .models import (
+from .schemas import (
     IdentifyTextRequest,
     IdentifyResponse,
     DimensionsResponse,
@@ -17,15 +20,48 @@ from .models import (
 )
 from .services.identification import identify_from_text, identify_from_image
 from .services.proposals import generate_proposals
-from .services.stl import generate_stl_files
+from .services.stl import generate_stl_files, shutdown_pool
 
 # NEW aggregator that pulls dimensions from Wikidata, manufacturer schema.org, and Wikipedia
 from .services.dimensions.fetcher import fetch_dimensions
+from .services.dimensions.client import make_client
+from .services.dimensions import http_cache
 
 DATA_DIR = Path("data")
 (DATA_DIR / "stl").mkdir(parents=True, exist_ok=True)
 
-app = FastAPI(title="Gridfinity Cutout Generator API", version="0.1.0")
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+UPLOAD_CHUNK = 64 * 1024
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled client per worker (why: keep-alive + TLS reuse across lookups)
+    app.state.http = make_client()
+    try:
+        yield
+    finally:
+        await app.state.http.aclose()
+        http_cache.flush()
+        shutdown_pool()
+
+
+app = FastAPI(
+    title="Gridfinity Cutout Generator API",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,  # why: C encoder for every response body
+)
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    # Why: reject oversized bodies before the multipart parser spools them.
+    # Registered before CORS so CORS stays outermost and the 413 carries its headers.
+    length = request.headers.get("content-length")
+    if length and length.isdigit() and int(length) > MAX_UPLOAD_BYTES:
+        return ORJSONResponse({"detail": "Upload too large"}, status_code=413)
+    return await call_next(request)
+
 
 # CORS (why: enable local dev UI)
 app.add_middleware(
@@ -36,6 +72,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
 app.mount("/files", StaticFiles(directory=str(DATA_DIR)), name="files")
 
 
@@ -53,17 +90,27 @@ async def identify_text(req: IdentifyTextRequest) -> IdentifyResponse:
 @app.post("/identify-image", response_model=IdentifyResponse)
 async def identify_image(file: UploadFile = File(...)) -> IdentifyResponse:
     # NOTE(why): separate image route for form-data UX
-    content = await file.read()
-    item = await identify_from_image(content)
+    item = await identify_from_image(_iter_upload(file))
     return item
 
 
+async def _iter_upload(file: UploadFile) -> AsyncIterator[bytes]:
+    """Yield the upload in bounded chunks instead of materializing one bytes copy."""
+    total = 0
+    while chunk := await file.read(UPLOAD_CHUNK):
+        total += len(chunk)
+        if total > MAX_UPLOAD_BYTES:  # chunked uploads carry no Content-Length
+            raise HTTPException(status_code=413, detail="Upload too large")
+        yield chunk
+
+
 @app.get("/dimensions", response_model=DimensionsResponse)
 async def dimensions(
+    request: Request,
     id: Optional[str] = None,
     q: Optional[str] = None,
     urls: Optional[str] = None,
-) -> DimensionsResponse:
+) -> Response:
     """Fetch exact dimensions from online sources.
 
     Supports:
@@ -75,11 +122,14 @@ async def dimensions(
     if urls:
         extra_urls = [u.strip() for u in urls.split(",") if u.strip()]
 
-    result, resolved_qid = await fetch_dimensions(qid=id, query=q, extra_urls=extra_urls)
+    result, resolved_qid, cache_hit = await fetch_dimensions(
+        qid=id, query=q, extra_urls=extra_urls, client=request.app.state.http
+    )
     if not result:
         raise HTTPException(status_code=404, detail="Dimensions not found")
 
-    return DimensionsResponse(
+    # NOTE(why): data is produced internally; skip validation and dump straight to JSON bytes
+    resp = DimensionsResponse.model_construct(
         id=resolved_qid or id,
         name=result.name,
         dims_mm=result.dims_mm,
@@ -88,18 +138,32 @@ async def dimensions(
         confidence=round(result.confidence, 2),
         evidence=result.evidence,
     )
+    return Response(
+        content=resp.model_dump_json(),
+        media_type="application/json",
+        headers={"X-Cache": "HIT" if cache_hit else "MISS"},
+    )
 
 
 @app.post("/proposals", response_model=ProposalsResponse)
-async def proposals(req: ProposalsRequest) -> ProposalsResponse:
-    return generate_proposals(req)
+async def proposals(req: ProposalsRequest) -> Response:
+    return Response(content=generate_proposals(req).model_dump_json(), media_type="application/json")
 
 
 @app.post("/stl", response_model=STLFilesResponse)
-async def stl(req: STLRequest) -> STLFilesResponse:
+def stl(req: STLRequest) -> STLFilesResponse:
+    # NOTE(why): sync def so FastAPI runs the CadQuery build on its threadpool, off the event loop
     urls = generate_stl_files(req, output_dir=DATA_DIR / "stl")
     return STLFilesResponse(files=urls)
 
 
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
+    # why: libuv event loop + C HTTP parser; one process per core via WEB_CONCURRENCY
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+    )
@@ -1,53 +1,77 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional, Literal
+from __future__ import annotations
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional, Dict, Literal
 
-class IdentifyTextRequest(BaseModel):
-    input: str = Field(..., description="Item description")
 
-class IdentifyImageResponseCandidate(BaseModel):
+class IdentifyCandidate(BaseModel):
     id: str
     name: str
-    confidence: float
+    confidence: float = Field(ge=0, le=1)
+
+
+class IdentifyTextRequest(BaseModel):
+    input: str = Field(..., min_length=1)
+
 
 class IdentifyResponse(BaseModel):
     item: str
-    candidates: List[IdentifyImageResponseCandidate]
+    candidates: List[IdentifyCandidate]
+
 
-class Dims(BaseModel):
+class Dimensions(BaseModel):
     L: float
     W: float
     H: float
 
+
 class DimensionsResponse(BaseModel):
-    id: str
-    name: str
-    dims_mm: Dims
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    # Keys L/W/H, optionally DIAMETER or T; providers may only know some of them.
+    id: Optional[str] = None
+    name: Optional[str] = None
+    dims_mm: Dict[str, float]
     source: str
+    source_url: Optional[str] = None
     confidence: float
+    evidence: List[str] = Field(default_factory=list)
+
 
 class Proposal(BaseModel):
+    # Frozen so proposals are hashable and safe to share between responses.
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     type: Literal["snug", "easy", "multi"]
     x_slots: int
     y_slots: int
     z_units: int
-    clearance: Optional[float] = None
+    clearance: float
     compartments: Optional[int] = None
 
+
 class ProposalsRequest(BaseModel):
     item_id: str
-    dims_mm: Dims
-    options: dict = {}
+    dims_mm: Dimensions
+    options: Dict[str, bool] = Field(default_factory=dict)
+
 
 class ProposalsResponse(BaseModel):
     proposals: List[Proposal]
 
+
 class STLRequest(BaseModel):
-    proposal_id: str
-    format: Literal["stl"] = "stl"
+    item_id: str
+    dims_mm: Dimensions
+    proposal: Proposal
+    options: Dict[str, bool] = Field(default_factory=dict)
+    label: Optional[str] = None
+
 
 class STLFile(BaseModel):
     type: str
     url: str
+    preview_url: Optional[str] = None  # Optional preview PNG URL
+
 
-class STLResponse(BaseModel):
-    files: List[STLFile]
+class STLFilesResponse(BaseModel):
+    files: List[STLFile]
\ No newline at end of file
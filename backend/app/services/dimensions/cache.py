@@ -0,0 +1,53 @@
+from __future__ import annotations
+import asyncio
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+from cachetools import TTLCache
+
+T = TypeVar("T")
+
+# Why: item dimensions are effectively static; an hour keeps hot items off the network.
+_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=3600)
+
+
+@dataclass(slots=True)
+class _KeyLock:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    users: int = 0  # callers holding or waiting on `lock`
+
+
+_LOCKS: Dict[Hashable, _KeyLock] = {}
+
+
+async def cached_fetch(
+    key: Hashable,
+    coro_factory: Callable[[], Awaitable[T]],
+    cache_if: Callable[[T], bool] = lambda _: True,
+) -> Tuple[T, bool]:
+    """Return (value, hit) for `key`, running `coro_factory` at most once per key.
+
+    Concurrent misses on the same key wait on a per-key lock and re-check the
+    cache (single-flight), so identical lookups share one upstream fetch.
+    Values rejected by `cache_if` are returned but not stored.
+    """
+    if key in _CACHE:
+        return _CACHE[key], True
+    entry = _LOCKS.get(key)
+    if entry is None:
+        entry = _LOCKS[key] = _KeyLock()
+    entry.users += 1
+    try:
+        async with entry.lock:
+            if key in _CACHE:
+                return _CACHE[key], True
+            value = await coro_factory()
+            if cache_if(value):
+                _CACHE[key] = value
+            return value, False
+    finally:
+        entry.users -= 1
+        # Why: drop the entry only once nobody holds or waits on it, which bounds
+        # the table without letting a newcomer start a second flight.
+        if entry.users == 0:
+            del _LOCKS[key]
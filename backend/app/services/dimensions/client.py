@@ -0,0 +1,19 @@
+from __future__ import annotations
+import httpx
+
+HEADERS = {"User-Agent": "GridfinityCutout/0.1 (https://example.com)"}
+
+
+def make_client() -> httpx.AsyncClient:
+    """Pooled client shared by all providers.
+
+    Why: one pool per process keeps TLS sessions to Wikidata/Wikipedia warm
+    instead of paying a fresh handshake on every lookup.
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=10,
+        headers=HEADERS,
+        follow_redirects=True,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    )
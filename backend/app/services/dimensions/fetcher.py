@@ -1,56 +1,170 @@
 from __future__ import annotations
-# 3) Wikipedia fallback via English sitelink title if we have a label
-# NOTE: For simplicity we reuse label as page title; a better approach is to query sitelinks via Wikidata.
-if not (best and {"L", "W", "H"}.issubset(best.dims_mm.keys())) and label:
-try:
-wi = await fetch_wikipedia_dimensions(label)
-except Exception:
-wi = None
-if wi:
-best = wi if not best else best.merge_missing(wi)
-
-
-return best, resolved_qid
-
-
-
-
-# File: backend/app/api/routes/dimensions.py
-from __future__ import annotations
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
-from ...services.dimensions.fetcher import fetch_dimensions
-
-
-router = APIRouter(prefix="/dimensions", tags=["dimensions"])
-
-
-
-
-@router.get("")
-async def get_dimensions(
-id: Optional[str] = Query(None, description="Wikidata QID, e.g., Q12345"),
-q: Optional[str] = Query(None, description="Free-text query to resolve via Wikidata"),
-urls: Optional[str] = Query(None, description="Comma-separated list of candidate URLs (manufacturer/marketplace)"),
-):
-extra_urls: List[str] = []
-if urls:
-extra_urls = [u.strip() for u in urls.split(",") if u.strip()]
-
-
-result, resolved_qid = await fetch_dimensions(qid=id, query=q, extra_urls=extra_urls)
-if not result:
-raise HTTPException(status_code=404, detail="No dimensions found from available sources.")
-
-
-payload = {
-"id": resolved_qid,
-"name": result.name,
-"dims_mm": result.dims_mm,
-"source": result.source,
-"source_url": result.source_url,
-"confidence": round(result.confidence, 2),
-"evidence": result.evidence,
+import asyncio
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, TypeVar
+from urllib.parse import urlsplit, urlunsplit
+import httpx
+from .cache import cached_fetch
+from .types import DimensionsResult
+from .wikidata import WikidataHit, fetch_wikidata, search_qid
+from .providers.schema_org import fetch_schema_org
+from .providers.wikipedia import fetch_wikipedia_dimensions
+
+
+_QID_RE = re.compile(r"^Q\d+$")
+# A full L/W/H box at this confidence is good enough to stop waiting on slower providers.
+# 0.9 is the top tier providers emit: referenced Wikidata statements and manufacturer pages.
+_EARLY_EXIT_CONFIDENCE = 0.9
+# Per-lookup cap on concurrent page fetches (why: don't drain the shared pool or trip retailer rate limits).
+_MAX_PAGE_FETCHES = 8
+
+T = TypeVar("T")
+
+# Simple fallback catalog (why: ensure demo works offline)
+FALLBACK: Dict[str, DimensionsResult] = {
+    "Qnintendo_switch_pro": DimensionsResult(
+        item_id="Qnintendo_switch_pro",
+        name="Nintendo Switch Pro Controller",
+        dims_mm={"L": 152.0, "W": 106.0, "H": 60.0},
+        source="fallback",
+        confidence=0.7,
+    )
 }
-return payload
 
+
+async def fetch_dimensions(
+    qid: Optional[str],
+    query: Optional[str],
+    extra_urls: List[str],
+    *,
+    client: httpx.AsyncClient,
+) -> Tuple[Optional[DimensionsResult], Optional[str], bool]:
+    """Cached front for `_fetch_dimensions`; returns (result, resolved_qid, cache_hit).
+
+    Misses (no result) are not cached so a transient upstream failure is retried.
+    """
+    urls = [u for u in dict.fromkeys(_canonicalize(u) for u in extra_urls) if u]
+    key = (qid, query, tuple(sorted(urls)))
+    (result, resolved_qid), hit = await cached_fetch(
+        key,
+        lambda: _fetch_dimensions(qid, query, urls, client=client),
+        cache_if=lambda value: value[0] is not None,
+    )
+    return result, resolved_qid, hit
+
+
+def _canonicalize(url: str) -> Optional[str]:
+    """Lowercase scheme/host and drop the fragment so trivially different URLs dedupe.
+
+    Returns None for URLs urlsplit rejects (e.g. an unclosed IPv6 bracket).
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return None
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", parts.query, ""))
+
+
+async def _bounded(sem: asyncio.Semaphore, fn: Callable[..., Awaitable[T]], *args: Any) -> T:
+    # Coroutine is created only once a slot is free, so cancelled waiters leave nothing un-awaited.
+    async with sem:
+        return await fn(*args)
+
+
+async def _wikidata(
+    qid: Optional[str], query: Optional[str], client: httpx.AsyncClient
+) -> Tuple[Optional[str], Optional[WikidataHit]]:
+    """Resolve the QID (if needed) and fetch its statements as one chain."""
+    resolved_qid = qid
+    if not resolved_qid and query:
+        try:
+            resolved_qid = await search_qid(query, client)
+        except Exception:
+            resolved_qid = None
+    if not (resolved_qid and _QID_RE.match(resolved_qid)):
+        return resolved_qid, None
+    try:
+        return resolved_qid, await fetch_wikidata(resolved_qid, client)
+    except Exception:
+        return resolved_qid, None
+
+
+def _has_box(result: DimensionsResult) -> bool:
+    return {"L", "W", "H"}.issubset(result.dims_mm.keys())
+
+
+async def _fetch_dimensions(
+    qid: Optional[str],
+    query: Optional[str],
+    extra_urls: List[str],
+    *,
+    client: httpx.AsyncClient,
+) -> Tuple[Optional[DimensionsResult], Optional[str]]:
+    """Aggregate dimensions from Wikidata, schema.org (official site & urls) and Wikipedia.
+
+    Providers run concurrently so latency is the slowest single chain rather
+    than the sum. Returns (best_result, resolved_qid). Provider errors are
+    swallowed so one flaky upstream never hides data from the others.
+    """
+    if qid in FALLBACK:
+        return FALLBACK[qid], qid
+
+    wd_task = asyncio.ensure_future(_wikidata(qid, query, client))
+    pending: Set[asyncio.Future] = {wd_task}
+    sem = asyncio.Semaphore(_MAX_PAGE_FETCHES)
+    pending.update(asyncio.ensure_future(_bounded(sem, fetch_schema_org, u, client)) for u in extra_urls)
+    # Speculative Wikipedia lookup on the raw query; superseded by the Wikidata sitelink.
+    wiki_guess = asyncio.ensure_future(fetch_wikipedia_dimensions(query, client)) if query else None
+    if wiki_guess:
+        pending.add(wiki_guess)
+
+    resolved_qid = qid
+    results: Dict[asyncio.Future, DimensionsResult] = {}
+    discarded: Set[asyncio.Future] = set()
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # Wikidata first: its sitelink decides whether the speculative guess survives.
+            for task in sorted(done, key=lambda t: t is not wd_task):
+                if task in discarded or task.cancelled() or task.exception() is not None:
+                    continue
+                if task is not wd_task:
+                    if task.result():
+                        results[task] = task.result()
+                    continue
+                resolved_qid, wd = task.result()
+                if not wd:
+                    continue
+                best, official, enwiki_title = wd
+                if best:
+                    results[task] = best
+                official = _canonicalize(official) if official else None
+                if official and official not in extra_urls:
+                    pending.add(asyncio.ensure_future(_bounded(sem, fetch_schema_org, official, client)))
+                if enwiki_title and enwiki_title != query and not (best and _has_box(best)):
+                    if wiki_guess:
+                        wiki_guess.cancel()
+                        discarded.add(wiki_guess)
+                        pending.discard(wiki_guess)
+                        results.pop(wiki_guess, None)
+                    pending.add(asyncio.ensure_future(fetch_wikipedia_dimensions(enwiki_title, client)))
+            if any(r.confidence >= _EARLY_EXIT_CONFIDENCE and _has_box(r) for r in results.values()):
+                if wd_task.done():
+                    break
+                # Why: a page can win the race, but the Wikidata chain still resolves the
+                # QID and item name; stop the other fetches and wait for it alone.
+                for task in pending - {wd_task}:
+                    task.cancel()
+                pending = {wd_task}
+    finally:
+        for task in pending:
+            task.cancel()
+
+    if not results:
+        return None, resolved_qid
+    # Fold highest confidence first so merge_missing keeps the most trusted values.
+    ranked = sorted(results.values(), key=lambda r: r.confidence, reverse=True)
+    best = ranked[0]
+    for other in ranked[1:]:
+        best = best.merge_missing(other)
+    return best, resolved_qid
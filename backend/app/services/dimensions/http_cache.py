@@ -0,0 +1,175 @@
+from __future__ import annotations
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+import httpx
+import orjson
+from .types import DimensionsResult
+
+
+HTTP_CACHE_PATH = Path("data") / "http_cache.db"
+_STREAM_CHUNK = 64 * 1024
+# Writes are committed in batches: every N puts or this many seconds after the first
+# uncommitted one, whichever comes first. Kept short because an open write transaction
+# makes other workers' writers wait (sqlite's busy timeout is 5 s).
+_COMMIT_EVERY = 32
+_COMMIT_INTERVAL = 1.0
+# Framing headers that no longer describe a body we've already decoded and truncated.
+_FRAMING_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+Entry = Tuple[Optional[str], Optional[str], str, Optional[DimensionsResult]]
+
+
+class ValidatorStore:
+    """Per-URL HTTP validators plus the parsed result they produced.
+
+    Why: a 304 (or an unchanged body) lets providers skip both the HTML
+    transfer and the parse pass, which dominate schema.org/Wikipedia cost.
+    """
+
+    def __init__(self, path: str | Path = HTTP_CACHE_PATH):
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        # Why: calls arrive from worker threads (asyncio.to_thread); one lock serializes the connection.
+        self._lock = threading.Lock()
+        self._uncommitted = 0
+        self._timer: Optional[threading.Timer] = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            # WAL: readers in other workers never wait on our batched write transaction.
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS validators ("
+                "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body_hash TEXT, result TEXT)"
+            )
+        return self._conn
+
+    def get(self, url: str) -> Optional[Entry]:
+        with self._lock:
+            row = self._db().execute(
+                "SELECT etag, last_modified, body_hash, result FROM validators WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, body_hash, result = row
+        data = orjson.loads(result)
+        return etag, last_modified, body_hash, DimensionsResult(**data) if data else None
+
+    def put(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        body_hash: str,
+        result: Optional[DimensionsResult],
+    ) -> None:
+        # raw payloads (extruct graphs, SPARQL rows) are debug-only; don't persist them
+        data = {**asdict(result), "raw": None} if result else None
+        with self._lock:
+            self._db().execute(
+                "INSERT OR REPLACE INTO validators VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, body_hash, orjson.dumps(data).decode()),
+            )
+            self._uncommitted += 1
+            # Why: a commit per cached page dominated warm lookups; losing a few
+            # validators on a crash only costs a refetch.
+            if self._uncommitted >= _COMMIT_EVERY:
+                self._commit()
+            elif self._timer is None:
+                self._timer = threading.Timer(_COMMIT_INTERVAL, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._uncommitted:
+                self._commit()
+
+    def _commit(self) -> None:
+        self._conn.commit()
+        self._uncommitted = 0
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+
+_store = ValidatorStore()
+
+
+def flush() -> None:
+    """Commit any batched validator writes; call on shutdown."""
+    _store.flush()
+
+
+async def _get_capped(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: Dict[str, str],
+    timeout: Optional[float],
+    max_bytes: int,
+) -> httpx.Response:
+    """Stream at most `max_bytes` of the body; the rest of the page is never downloaded."""
+    chunks: List[bytes] = []
+    total = 0
+    async with client.stream("GET", url, headers=headers, timeout=timeout) as r:
+        async for chunk in r.aiter_bytes(_STREAM_CHUNK):
+            chunks.append(chunk)
+            total += len(chunk)
+            if total >= max_bytes:
+                break
+    kept = [(k, v) for k, v in r.headers.multi_items() if k.lower() not in _FRAMING_HEADERS]
+    return httpx.Response(r.status_code, headers=kept, content=b"".join(chunks)[:max_bytes], request=r.request)
+
+
+async def conditional_fetch(
+    client: httpx.AsyncClient,
+    url: str,
+    parse: Callable[[httpx.Response], Optional[DimensionsResult]],
+    *,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+    store: Optional[ValidatorStore] = None,
+    max_bytes: Optional[int] = None,
+) -> Optional[DimensionsResult]:
+    """GET `url` with If-None-Match/If-Modified-Since and reuse the stored parse on 304.
+
+    `parse` runs only when the body actually changed; it may raise or return
+    None for unusable responses exactly as the provider would without caching.
+    With `max_bytes`, only that prefix of the body is downloaded and parsed.
+    """
+    store = store or _store
+    # sqlite I/O runs off the event loop
+    entry = await asyncio.to_thread(store.get, url)
+    req_headers = dict(headers or {})
+    if entry:
+        etag, last_modified, _, _ = entry
+        if etag:
+            req_headers["If-None-Match"] = etag
+        if last_modified:
+            req_headers["If-Modified-Since"] = last_modified
+
+    if max_bytes is None:
+        r = await client.get(url, headers=req_headers, timeout=timeout)
+    else:
+        r = await _get_capped(client, url, req_headers, timeout, max_bytes)
+    if r.status_code == 304 and entry:
+        return entry[3]
+
+    body_hash = hashlib.blake2b(r.content, digest_size=16).hexdigest()
+    if entry and r.status_code == 200 and entry[2] == body_hash:
+        return entry[3]
+
+    result = parse(r)
+    if r.status_code == 200:
+        await asyncio.to_thread(
+            store.put, url, r.headers.get("ETag"), r.headers.get("Last-Modified"), body_hash, result
+        )
+    return result
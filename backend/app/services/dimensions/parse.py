@@ -1,60 +1,71 @@
 from __future__ import annotations
+import re
+from typing import Dict, Optional, Tuple
 from .units import to_mm
 
 
-_DIM_RE = re.compile(
-r"(?P<a>\d{1,4}(?:[\.,]\d{1,3})?)\s*[×xX*]\s*(?P<b>\d{1,4}(?:[\.,]\d{1,3})?)\s*[×xX*]\s*(?P<c>\d{1,4}(?:[\.,]\d{1,3})?)\s*(?P<unit>mm|millimetre|millimeter|cm|centimetre|centimeter|m|metre|meter|in|inch|inches|″|"|ft|foot|feet|′)?",
-re.IGNORECASE,
-)
-_NUM_UNIT_RE = re.compile(
-r"(?P<val>\d{1,4}(?:[\.,]\d{1,3})?)\s*(?P<unit>mm|millimetre|millimeter|cm|centimetre|centimeter|m|metre|meter|in|inch|inches|″|"|ft|foot|feet|′)",
-re.IGNORECASE,
-)
-
+_NUM = r"\d{1,4}(?:[\.,]\d{1,3})?"
+_UNIT = r"(?:mm|millimet(?:re|er)|cm|centimet(?:re|er)|m(?:et(?:re|er))?|in(?:ch(?:es)?)?|″|\"|ft|foot|feet|′)"
+_TRIPLET = rf"(?P<a>{_NUM})\s*[×xX*]\s*(?P<b>{_NUM})\s*[×xX*]\s*(?P<c>{_NUM})\s*(?P<tunit>{_UNIT})?"
+_SINGLE = rf"(?P<val>{_NUM})\s*(?P<unit>{_UNIT})"
 
+# Why: one compiled alternation walks the text once instead of a triplet pass then a single pass.
+SCAN_RE = re.compile(rf"(?:{_TRIPLET}|{_SINGLE})", re.IGNORECASE)
+_SINGLE_RE = re.compile(_SINGLE, re.IGNORECASE)
 
 
 def _to_float(s: str) -> float:
-return float(s.replace(",", "."))
-
+    return float(s.replace(",", "."))
 
 
+def _scan(text: str) -> Tuple[Optional[re.Match], Optional[re.Match]]:
+    """Return (first triplet match, first single match) from one pass over `text`.
 
-def parse_triplet(text: str) -> Optional[Tuple[float, float, float, Optional[str]]]:
-m = _DIM_RE.search(text)
-if not m:
-return None
-a = _to_float(m.group("a"))
-b = _to_float(m.group("b"))
-c = _to_float(m.group("c"))
-unit = m.group("unit")
-return a, b, c, unit
+    Triplets win wherever they appear, so scanning stops at the first one.
+    """
+    single = None
+    for m in SCAN_RE.finditer(text):
+        if m.group("a") is not None:
+            return m, single
+        if single is None:
+            single = m
+    return None, single
 
 
+def parse_triplet(text: str) -> Optional[Tuple[float, float, float, Optional[str]]]:
+    m, _ = _scan(text)
+    if not m:
+        return None
+    return _triplet(m)
 
 
 def parse_single(text: str) -> Optional[Tuple[float, Optional[str]]]:
-m = _NUM_UNIT_RE.search(text)
-if not m:
-return None
-return _to_float(m.group("val")), m.group("unit")
+    # Independent search: a value inside a triplet still counts, as it always has.
+    m = _SINGLE_RE.search(text)
+    if not m:
+        return None
+    return _to_float(m.group("val")), m.group("unit")
 
 
+def _triplet(m: re.Match) -> Tuple[float, float, float, Optional[str]]:
+    a = _to_float(m.group("a"))
+    b = _to_float(m.group("b"))
+    c = _to_float(m.group("c"))
+    unit = m.group("tunit")
+    return a, b, c, unit
 
 
 def normalize_dims_from_text(text: str) -> Optional[Dict[str, float]]:
-"""Try to parse common dimension strings like "152 × 106 × 60 mm".
-Why: many sites serialize dimensions as free text.
-"""
-triple = parse_triplet(text)
-if triple:
-a, b, c, unit = triple
-factor = to_mm(1.0, unit) or 1.0
-return {"L": a * factor, "W": b * factor, "H": c * factor}
-one = parse_single(text)
-if one: # Could be diameter, thickness, etc. Caller must map.
-val, unit = one
-factor = to_mm(1.0, unit) or 1.0
-return {"L": val * factor}
-return None
-
+    """Try to parse common dimension strings like "152 × 106 × 60 mm".
+    Why: many sites serialize dimensions as free text.
+    """
+    triple_m, single_m = _scan(text)
+    if triple_m:
+        a, b, c, unit = _triplet(triple_m)
+        factor = to_mm(1.0, unit) or 1.0
+        return {"L": a * factor, "W": b * factor, "H": c * factor}
+    if single_m:  # Could be diameter, thickness, etc. Caller must map.
+        val, unit = _to_float(single_m.group("val")), single_m.group("unit")
+        factor = to_mm(1.0, unit) or 1.0
+        return {"L": val * factor}
+    return None
@@ -1,80 +1,162 @@
 from __future__ import annotations
-dims[out_key] = mm
-
-
-# size as QuantitativeValue or string
-size = product.get("size")
-if size:
-if isinstance(size, dict):
-mm = qv_to_mm(size)
-if mm is not None:
-dims.setdefault("L", mm)
-elif isinstance(size, str):
-parsed = normalize_dims_from_text(size)
-if parsed:
-dims = {**parsed, **dims}
-
-
-# additionalProperty entries sometimes contain dimensions
-add_props = product.get("additionalProperty") or []
-if isinstance(add_props, dict):
-add_props = [add_props]
-for ap in add_props:
-name = (ap.get("name") or "").lower()
-val = ap.get("value")
-if not val:
-continue
-parsed = normalize_dims_from_text(str(val))
-if parsed:
-dims = {**parsed, **dims}
-
-
-return dims
-
-
-
-
-async def fetch_schema_org(url: str) -> Optional[DimensionsResult]:
-if extruct is None:
-return None
-async with httpx.AsyncClient(headers=_HEADERS, timeout=20, follow_redirects=True) as client:
-r = await client.get(url)
-r.raise_for_status()
-html = r.text
-data = extruct.extract(html, syntaxes=["json-ld", "microdata", "rdfa"]) # type: ignore
-
-
-candidates: List[Dict[str, Any]] = []
-for blob in data.get("json-ld", []):
-# normalize to dict
-if isinstance(blob, dict):
-types = blob.get("@type")
-if types == "Product" or (isinstance(types, list) and "Product" in types):
-candidates.append(blob)
-elif isinstance(blob, list):
-for b in blob:
-if isinstance(b, dict):
-types = b.get("@type")
-if types == "Product" or (isinstance(types, list) and "Product" in types):
-candidates.append(b)
-
-
-dims: Dict[str, float] = {}
-for prod in candidates:
-extracted = _extract_from_product(prod)
-dims.update(extracted)
-
-
-if not dims:
-return None
-
-
-return DimensionsResult(
-dims_mm=dims,
-source="schema.org",
-source_url=url,
-confidence=0.9 if url else 0.85, # manufacturer pages typically high
-evidence=[f"schema.org Product fields from {url}"],
-raw=data,
-)
-
+import os
+from typing import Any, Dict, List, Optional
+import httpx
+import orjson
+from ..http_cache import conditional_fetch
+from ..types import DimensionsResult
+from ..units import to_mm
+from ..parse import normalize_dims_from_text
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser  # type: ignore
+except Exception:  # pragma: no cover
+    HTMLParser = None
+
+try:
+    import extruct  # type: ignore
+except Exception:  # pragma: no cover
+    extruct = None
+
+# Why: extruct runs three full parsers (json-ld, microdata, rdfa); keep it opt-in
+# for sites that need it, and use a single selectolax pass for json-ld otherwise.
+USE_EXTRUCT = os.getenv("SCHEMA_ORG_USE_EXTRUCT", "").lower() in ("1", "true", "yes")
+
+
+_HEADERS = {"User-Agent": "GridfinityCutoutBot/1.0 (+dimensions)"}
+# Why: json-ld sits in <head>; tracker-heavy product pages can run to many MB past it.
+MAX_PAGE_BYTES = 2_000_000
+
+# schema.org Product property -> our dimension key
+_PRODUCT_DIM_KEYS = {
+    "height": "H",
+    "width": "W",
+    "depth": "L",
+    "length": "L",
+}
+
+
+def qv_to_mm(qv: Any) -> Optional[float]:
+    """Convert a schema.org QuantitativeValue (or bare string) to millimetres."""
+    if isinstance(qv, dict):
+        value = qv.get("value")
+        unit = qv.get("unitCode") or qv.get("unitText")
+        if value is None:
+            return None
+        try:
+            amount = float(str(value).replace(",", "."))
+        except ValueError:
+            return None
+        return to_mm(amount, unit)
+    if isinstance(qv, str):
+        parsed = normalize_dims_from_text(qv)
+        if parsed and len(parsed) == 1:
+            return parsed["L"]
+    return None
+
+
+def _extract_from_product(product: Dict[str, Any]) -> Dict[str, float]:
+    dims: Dict[str, float] = {}
+
+    # explicit height/width/depth fields
+    for key, out_key in _PRODUCT_DIM_KEYS.items():
+        mm = qv_to_mm(product.get(key))
+        if mm is None:
+            continue
+        if out_key in dims:
+            continue
+        dims[out_key] = mm
+
+    # size as QuantitativeValue or string
+    size = product.get("size")
+    if size:
+        if isinstance(size, dict):
+            mm = qv_to_mm(size)
+            if mm is not None:
+                dims.setdefault("L", mm)
+        elif isinstance(size, str):
+            parsed = normalize_dims_from_text(size)
+            if parsed:
+                dims = {**parsed, **dims}
+
+    # additionalProperty entries sometimes contain dimensions
+    add_props = product.get("additionalProperty") or []
+    if isinstance(add_props, dict):
+        add_props = [add_props]
+    for ap in add_props:
+        name = (ap.get("name") or "").lower()
+        val = ap.get("value")
+        if not val:
+            continue
+        parsed = normalize_dims_from_text(str(val))
+        if parsed:
+            dims = {**parsed, **dims}
+
+    return dims
+
+
+def _is_product(blob: Any) -> bool:
+    if not isinstance(blob, dict):
+        return False
+    types = blob.get("@type")
+    return types == "Product" or (isinstance(types, list) and "Product" in types)
+
+
+def _jsonld_blobs(html: str) -> List[Any]:
+    """Decode every json-ld script block; malformed blocks are skipped."""
+    if HTMLParser is None or (USE_EXTRUCT and extruct is not None):
+        data = extruct.extract(html, syntaxes=["json-ld"])  # type: ignore
+        return data.get("json-ld", [])
+    blobs: List[Any] = []
+    for node in HTMLParser(html).css('script[type="application/ld+json"]'):
+        try:
+            blobs.append(orjson.loads(node.text()))
+        except orjson.JSONDecodeError:
+            continue
+    return blobs
+
+
+def _product_candidates(blobs: List[Any]) -> List[Dict[str, Any]]:
+    candidates: List[Dict[str, Any]] = []
+    stack = list(blobs)
+    while stack:
+        blob = stack.pop(0)
+        # normalize to dict; json-ld may wrap entities in lists or @graph
+        if isinstance(blob, list):
+            stack.extend(blob)
+        elif isinstance(blob, dict):
+            if isinstance(blob.get("@graph"), list):
+                stack.extend(blob["@graph"])
+            if _is_product(blob):
+                candidates.append(blob)
+    return candidates
+
+
+async def fetch_schema_org(url: str, client: httpx.AsyncClient) -> Optional[DimensionsResult]:
+    if HTMLParser is None and extruct is None:
+        return None
+    return await conditional_fetch(
+        client, url, lambda r: _parse_response(url, r), headers=_HEADERS, timeout=20, max_bytes=MAX_PAGE_BYTES
+    )
+
+
+def _parse_response(url: str, r: httpx.Response) -> Optional[DimensionsResult]:
+    r.raise_for_status()
+    blobs = _jsonld_blobs(r.text)
+
+    dims: Dict[str, float] = {}
+    for prod in _product_candidates(blobs):
+        extracted = _extract_from_product(prod)
+        dims.update(extracted)
+
+    if not dims:
+        return None
+
+    return DimensionsResult(
+        dims_mm=dims,
+        source="schema.org",
+        source_url=url,
+        confidence=0.9 if url else 0.85,  # manufacturer pages typically high
+        evidence=[f"schema.org Product fields from {url}"],
+        raw=blobs,
+    )
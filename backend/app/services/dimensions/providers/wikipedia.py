@@ -2,38 +2,64 @@ from __future__ import annotations
 from typing import Optional
 import httpx
 import re
+from ..http_cache import conditional_fetch
 from ..types import DimensionsResult
 from ..parse import normalize_dims_from_text
 
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser  # type: ignore
+except Exception:  # pragma: no cover
+    HTMLParser = None
+
 
 _HEADERS = {"User-Agent": "GridfinityCutoutBot/1.0 (+dimensions)"}
 
 
 _DIM_ROW_RE = re.compile(r"<tr>\s*<th[^>]*>\s*Dimensions\s*</th>\s*<td[^>]*>(.*?)</td>", re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+
+
+def _infobox_cell(html: str) -> Optional[str]:
+    """Text of the infobox "Dimensions" value cell, whitespace-collapsed."""
+    if HTMLParser is None:
+        m = _DIM_ROW_RE.search(html)
+        if not m:
+            return None
+        return _WS_RE.sub(" ", _TAG_RE.sub(" ", m.group(1))).strip()
+    # Why: walking the infobox rows avoids a DOTALL regex over the whole page
+    for th in HTMLParser(html).css("table.infobox tr > th"):
+        if th.text(strip=True).lower() != "dimensions":
+            continue
+        td = th.parent.css_first("td")
+        if td is None:
+            return None
+        return _WS_RE.sub(" ", td.text(separator=" ", strip=True)).strip()
+    return None
+
 
+async def fetch_wikipedia_dimensions(page_title: str, client: httpx.AsyncClient) -> Optional[DimensionsResult]:
+    # English Wikipedia only for now
+    url = f"https://en.wikipedia.org/wiki/{page_title.replace(' ', '_')}"
+    return await conditional_fetch(
+        client, url, lambda r: _parse_response(url, r), headers=_HEADERS, timeout=15
+    )
 
-async def fetch_wikipedia_dimensions(page_title: str) -> Optional[DimensionsResult]:
-# English Wikipedia only for now
-url = f"https://en.wikipedia.org/wiki/{page_title.replace(' ', '_')}"
-async with httpx.AsyncClient(headers=_HEADERS, timeout=15) as client:
-r = await client.get(url)
-if r.status_code != 200:
-return None
-html = r.text
-m = _DIM_ROW_RE.search(html)
-if not m:
-return None
-cell = re.sub(r"<[^>]+>", " ", m.group(1))
-cell = re.sub(r"\s+", " ", cell).strip()
-parsed = normalize_dims_from_text(cell)
-if not parsed:
-return None
-return DimensionsResult(
-dims_mm=parsed,
-source="Wikipedia infobox",
-source_url=url,
-confidence=0.6,
-evidence=[f"Infobox cell: {cell}"],
-raw=cell,
-)
 
+def _parse_response(url: str, r: httpx.Response) -> Optional[DimensionsResult]:
+    if r.status_code != 200:
+        return None
+    cell = _infobox_cell(r.text)
+    if not cell:
+        return None
+    parsed = normalize_dims_from_text(cell)
+    if not parsed:
+        return None
+    return DimensionsResult(
+        dims_mm=parsed,
+        source="Wikipedia infobox",
+        source_url=url,
+        confidence=0.6,
+        evidence=[f"Infobox cell: {cell}"],
+        raw=cell,
+    )
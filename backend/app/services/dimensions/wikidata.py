@@ -1,53 +1,175 @@
 from __future__ import annotations
-rows = data.get("results", {}).get("bindings", [])
-if not rows:
-return None
-
-
-dims: Dict[str, float] = {}
-refs_total = 0
-official = None
-label = None
-for b in rows:
-prop = b["prop"]["value"]
-amt = float(b["amount"]["value"]) # raw unit
-unit_uri = b.get("unit", {}).get("value")
-mm = to_mm(amt, unit_uri)
-if mm is None:
-continue
-if prop == "height":
-dims["H"] = mm
-elif prop == "width":
-dims["W"] = mm
-elif prop in ("length", "depth"):
-# Prefer length over depth if both appear; keep first occurrence
-dims.setdefault("L", mm)
-elif prop == "thickness":
-dims["T"] = mm
-elif prop == "diameter":
-dims["DIAMETER"] = mm
-refs = int(b.get("refs", {}).get("value", "0")) if b.get("refs") else 0
-refs_total += refs
-if b.get("official"):
-official = b["official"]["value"]
-if b.get("label"):
-label = b["label"]["value"]
-
-
-if not dims:
-return None
-
-
-base_conf = 0.8 # Wikidata baseline
-if refs_total > 0:
-base_conf += 0.1
-return DimensionsResult(
-item_id=qid,
-name=label,
-dims_mm=dims,
-source="Wikidata",
-source_url=f"https://www.wikidata.org/wiki/{qid}",
-confidence=min(base_conf, 0.95),
-evidence=[f"SPARQL rows={len(rows)} refs_total={refs_total}"],
-raw=rows,
-), official
+import asyncio
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import httpx
+import orjson
+from .types import DimensionsResult
+from .units import to_mm
+
+try:
+    import diskcache  # type: ignore
+except Exception:  # pragma: no cover
+    diskcache = None
+
+
+SPARQL_ENDPOINT = "https://query.wikidata.org/sparql"
+SEARCH_ENDPOINT = "https://www.wikidata.org/w/api.php"
+_SPARQL_HEADERS = {"Accept": "application/sparql-results+json"}
+
+WIKIDATA_CACHE_DIR = Path("data") / "wikidata_cache"
+# Why: physical dimensions on Wikidata almost never change week to week.
+WIKIDATA_CACHE_TTL = 7 * 86400
+# Bump when the SPARQL shape or result fields change so stale entries are never read back.
+_CACHE_VERSION = "v3"
+_disk: Optional[Any] = None
+
+
+def _disk_cache() -> Optional[Any]:
+    global _disk
+    if _disk is None and diskcache is not None:
+        _disk = diskcache.Cache(str(WIKIDATA_CACHE_DIR), size_limit=200_000_000)
+    return _disk
+
+
+def _sparql_for_item(qid: str) -> str:
+    # Why: full statement values (psv:) carry the unit; truthy wdt: values do not.
+    # Label, website and sitelink sit in their own UNION branch so they come back
+    # even for items without any dimension statements.
+    return f"""
+    SELECT ?prop ?amount ?unit ?label ?official ?enwikiTitle (COUNT(?ref) AS ?refs) WHERE {{
+      {{
+        VALUES (?p ?psv ?prop) {{
+          (p:P2048 psv:P2048 "height")
+          (p:P2049 psv:P2049 "width")
+          (p:P2043 psv:P2043 "length")
+          (p:P5524 psv:P5524 "depth")
+          (p:P2610 psv:P2610 "thickness")
+          (p:P2386 psv:P2386 "diameter")
+        }}
+        wd:{qid} ?p ?st .
+        ?st ?psv ?v .
+        ?v wikibase:quantityAmount ?amount ;
+           wikibase:quantityUnit ?unit .
+        OPTIONAL {{ ?st prov:wasDerivedFrom ?ref . }}
+      }} UNION {{
+        OPTIONAL {{ wd:{qid} wdt:P856 ?official . }}
+        OPTIONAL {{ wd:{qid} rdfs:label ?label . FILTER(LANG(?label) = "en") }}
+        OPTIONAL {{
+          ?article schema:about wd:{qid} ;
+                   schema:isPartOf <https://en.wikipedia.org/> ;
+                   schema:name ?enwikiTitle .
+        }}
+      }}
+    }}
+    GROUP BY ?prop ?amount ?unit ?label ?official ?enwikiTitle
+    """
+
+
+async def search_qid(query: str, client: httpx.AsyncClient) -> Optional[str]:
+    """Resolve free text to the top Wikidata search hit."""
+    params = {
+        "action": "wbsearchentities",
+        "search": query,
+        "language": "en",
+        "format": "json",
+        "limit": 1,
+    }
+    r = await client.get(SEARCH_ENDPOINT, params=params)
+    r.raise_for_status()
+    hits = orjson.loads(r.content).get("search", [])
+    return hits[0]["id"] if hits else None
+
+
+WikidataHit = Tuple[Optional[DimensionsResult], Optional[str], Optional[str]]
+
+
+async def fetch_wikidata(qid: str, client: httpx.AsyncClient) -> Optional[WikidataHit]:
+    """Return (result, official_website, enwiki_title) for a QID, or None if nothing usable.
+
+    `result` is None when the item has no usable dimensions but does have a
+    website or sitelink. The English Wikipedia title comes from the item's
+    sitelink, so callers get the exact page name rather than guessing it from the label.
+
+    Successful lookups persist in a disk cache for a week when diskcache is installed.
+    """
+    cache = _disk_cache()
+    key = f"wd:{qid}:{_CACHE_VERSION}"
+    if cache is not None:
+        # diskcache is blocking sqlite/file I/O; keep it off the event loop
+        hit = await asyncio.to_thread(cache.get, key)
+        if hit is not None:
+            result = DimensionsResult(**hit["result"]) if hit["result"] else None
+            return result, hit["official"], hit["enwiki_title"]
+    found = await _query_wikidata(qid, client)
+    if found is not None and cache is not None:
+        result, official, enwiki_title = found
+        await asyncio.to_thread(
+            cache.set,
+            key,
+            {"result": asdict(result) if result else None, "official": official, "enwiki_title": enwiki_title},
+            expire=WIKIDATA_CACHE_TTL,
+        )
+    return found
+
+
+async def _query_wikidata(qid: str, client: httpx.AsyncClient) -> Optional[WikidataHit]:
+    r = await client.get(SPARQL_ENDPOINT, params={"query": _sparql_for_item(qid)}, headers=_SPARQL_HEADERS)
+    r.raise_for_status()
+    data = orjson.loads(r.content)
+    rows = data.get("results", {}).get("bindings", [])
+    if not rows:
+        return None
+
+    dims: Dict[str, float] = {}
+    refs_total = 0
+    official = None
+    label = None
+    enwiki_title = None
+    for b in rows:
+        if b.get("official"):
+            official = b["official"]["value"]
+        if b.get("label"):
+            label = b["label"]["value"]
+        if b.get("enwikiTitle"):
+            enwiki_title = b["enwikiTitle"]["value"]
+        if not b.get("prop"):
+            continue  # metadata-only row
+        prop = b["prop"]["value"]
+        amt = float(b["amount"]["value"])  # raw unit
+        unit_uri = b.get("unit", {}).get("value")
+        mm = to_mm(amt, unit_uri)
+        if mm is None:
+            continue
+        if prop == "height":
+            dims["H"] = mm
+        elif prop == "width":
+            dims["W"] = mm
+        elif prop in ("length", "depth"):
+            # Prefer length over depth if both appear; keep first occurrence
+            dims.setdefault("L", mm)
+        elif prop == "thickness":
+            dims["T"] = mm
+        elif prop == "diameter":
+            dims["DIAMETER"] = mm
+        refs = int(b.get("refs", {}).get("value", "0")) if b.get("refs") else 0
+        refs_total += refs
+
+    if not dims:
+        # Why: the sitelink/website still lets the caller try Wikipedia or the maker's page.
+        return (None, official, enwiki_title) if official or enwiki_title else None
+
+    base_conf = 0.8  # Wikidata baseline
+    if refs_total > 0:
+        base_conf += 0.1
+    return DimensionsResult(
+        item_id=qid,
+        name=label,
+        dims_mm=dims,
+        source="Wikidata",
+        source_url=f"https://www.wikidata.org/wiki/{qid}",
+        confidence=min(base_conf, 0.95),
+        evidence=[f"SPARQL rows={len(rows)} refs_total={refs_total}"],
+        raw=rows,
+    ), official, enwiki_title
@@ -1,22 +1,77 @@
 from __future__ import annotations
-from ..models import IdentifyResponse, IdentifyCandidate
+import asyncio
+import hashlib
+from pathlib import Path
+from typing import Any, AsyncIterable, Optional
+
+from async_lru import alru_cache
+
+from ..schemas import IdentifyResponse, IdentifyCandidate
+
+try:
+    import diskcache  # type: ignore
+except Exception:  # pragma: no cover
+    diskcache = None
 
 # NOTE(why): MVP keeps this deterministic and offline-friendly; swap in real LLM later.
 
+IDENTIFY_CACHE_DIR = Path("data") / "identify_cache"
+_disk: Optional[Any] = None
+
+
+def _disk_cache() -> Optional[Any]:
+    # Why: a persistent tier keeps model answers across restarts when diskcache is installed.
+    global _disk
+    if _disk is None and diskcache is not None:
+        _disk = diskcache.Cache(str(IDENTIFY_CACHE_DIR))
+    return _disk
+
+
+def _normalize(user_input: str) -> str:
+    return " ".join(user_input.lower().split())
+
 
 async def identify_from_text(user_input: str) -> IdentifyResponse:
-    name = user_input.strip()
+    result = await _identify_cached(_normalize(user_input))
+    # The cache is keyed on the normalized text only; every field that echoes the
+    # query is filled from this caller's own spelling.
+    display = " ".join(user_input.split())
+    return result.model_copy(update={
+        "item": display,
+        "candidates": [c.model_copy(update={"name": display}) for c in result.candidates],
+    })
+
+
+@alru_cache(maxsize=4096)
+async def _identify_cached(norm: str) -> IdentifyResponse:
+    disk = _disk_cache()
+    if disk is not None:
+        # diskcache is blocking file I/O; keep it off the event loop
+        hit = await asyncio.to_thread(disk.get, norm)
+        if hit is not None:
+            return IdentifyResponse.model_validate(hit)
+    result = await _identify(norm)
+    if disk is not None:
+        await asyncio.to_thread(disk.set, norm, result.model_dump())
+    return result
+
+
+async def _identify(norm: str) -> IdentifyResponse:
     # naive deterministic ID (slug)
-    qid = f"Q{name.lower().replace(' ', '_')[:16]}"
+    qid = f"Q{norm.replace(' ', '_')[:16]}"
     return IdentifyResponse(
-        item=name,
-        candidates=[IdentifyCandidate(id=qid, name=name, confidence=0.75)],
+        item=norm,
+        candidates=[IdentifyCandidate(id=qid, name=norm, confidence=0.75)],
     )
 
 
-async def identify_from_image(content: bytes) -> IdentifyResponse:
+async def identify_from_image(chunks: AsyncIterable[bytes]) -> IdentifyResponse:
+    # Content hash is the identity key; chunks are consumed as they arrive.
+    hasher = hashlib.blake2b(digest_size=16)
+    async for chunk in chunks:
+        hasher.update(chunk)
     # Placeholder: return an unknown item with low confidence
     return IdentifyResponse(
         item="unknown",
-        candidates=[IdentifyCandidate(id="Qunknown", name="unknown item", confidence=0.2)],
+        candidates=[IdentifyCandidate(id=f"Qimage_{hasher.hexdigest()}", name="unknown item", confidence=0.2)],
     )
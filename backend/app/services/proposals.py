@@ -1,6 +1,5 @@
 from __future__ import annotations
-import math
-from ..models import ProposalsRequest, ProposalsResponse, Proposal
+from ..schemas import ProposalsRequest, ProposalsResponse, Proposal
 
 GRID_XY = 42.0
 GRID_Z = 7.0
@@ -9,43 +8,55 @@ DEFAULT_CLEARANCE_EASY = 0.8
 WALL = 2.0
 BASE = 3.0
 
+# Integer micrometre mirrors (why: exact ceil-div, no float rounding at grid boundaries)
+GRID_XY_UM = 42000
+GRID_Z_UM = 7000
+WALL_UM = 2000
+BASE_UM = 3000
+
+
+def _um(mm: float) -> int:
+    return int(round(mm * 1000))
+
 
 def _slots(size_mm: float, clearance: float) -> int:
-    needed = size_mm + clearance + 2 * WALL
-    return max(1, math.ceil(needed / GRID_XY))
+    needed = _um(size_mm) + _um(clearance) + 2 * WALL_UM
+    return max(1, (needed + GRID_XY_UM - 1) // GRID_XY_UM)
 
 
 def _z_units(height_mm: float, clearance: float) -> int:
-    needed = height_mm + clearance + BASE
-    return max(1, math.ceil(needed / GRID_Z))
+    needed = _um(height_mm) + _um(clearance) + BASE_UM
+    return max(1, (needed + GRID_Z_UM - 1) // GRID_Z_UM)
+
+
+# Fixed per-type fields built once; requests only fill in the slot counts.
+_SNUG_BASE = Proposal.model_construct(type="snug", x_slots=0, y_slots=0, z_units=0, clearance=DEFAULT_CLEARANCE_SNUG)
+_EASY_BASE = Proposal.model_construct(type="easy", x_slots=0, y_slots=0, z_units=0, clearance=DEFAULT_CLEARANCE_EASY)
+_MULTI_BASE = Proposal.model_construct(
+    type="multi", x_slots=0, y_slots=0, z_units=0, clearance=DEFAULT_CLEARANCE_EASY, compartments=2
+)
 
 
 def generate_proposals(req: ProposalsRequest) -> ProposalsResponse:
     L, W, H = req.dims_mm.L, req.dims_mm.W, req.dims_mm.H
 
-    snug = Proposal(
-        type="snug",
-        x_slots=_slots(L, DEFAULT_CLEARANCE_SNUG),
-        y_slots=_slots(W, DEFAULT_CLEARANCE_SNUG),
-        z_units=_z_units(H, DEFAULT_CLEARANCE_SNUG),
-        clearance=DEFAULT_CLEARANCE_SNUG,
-    )
-
-    easy = Proposal(
-        type="easy",
-        x_slots=_slots(L, DEFAULT_CLEARANCE_EASY),
-        y_slots=_slots(W, DEFAULT_CLEARANCE_EASY),
-        z_units=_z_units(H, DEFAULT_CLEARANCE_EASY),
-        clearance=DEFAULT_CLEARANCE_EASY,
-    )
-
-    multi = Proposal(
-        type="multi",
-        x_slots=max(snug.x_slots, 2),
-        y_slots=max(snug.y_slots, 2),
-        z_units=snug.z_units,
-        clearance=DEFAULT_CLEARANCE_EASY,
-        compartments=2,
-    )
-
-    return ProposalsResponse(proposals=[snug, easy, multi])
+    snug = _SNUG_BASE.model_copy(update={
+        "x_slots": _slots(L, DEFAULT_CLEARANCE_SNUG),
+        "y_slots": _slots(W, DEFAULT_CLEARANCE_SNUG),
+        "z_units": _z_units(H, DEFAULT_CLEARANCE_SNUG),
+    })
+
+    easy = _EASY_BASE.model_copy(update={
+        "x_slots": _slots(L, DEFAULT_CLEARANCE_EASY),
+        "y_slots": _slots(W, DEFAULT_CLEARANCE_EASY),
+        "z_units": _z_units(H, DEFAULT_CLEARANCE_EASY),
+    })
+
+    multi = _MULTI_BASE.model_copy(update={
+        "x_slots": max(snug.x_slots, 2),
+        "y_slots": max(snug.y_slots, 2),
+        "z_units": snug.z_units,
+    })
+
+    # NOTE(why): values are computed here, not user input; skip re-validation
+    return ProposalsResponse.model_construct(proposals=[snug, easy, multi])
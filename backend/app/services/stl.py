@@ -1,17 +1,33 @@
 from __future__ import annotations
-from dataclasses import dataclass
+import hashlib
+import importlib.util
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional
 
-try:
-    import cadquery as cq
-except Exception as e:  # pragma: no cover
-    cq = None
+import orjson
 
-from ..models import STLRequest, STLFile, Proposal
+from ..schemas import STLRequest, STLFile, Proposal
 
+# Why: importing CadQuery pulls in OCCT (seconds, hundreds of MB); only STL builders pay for it.
+cq = None
+CADQUERY_AVAILABLE = importlib.util.find_spec("cadquery") is not None
 
-@dataclass
+
+def _load_cadquery():
+    global cq
+    if cq is None:
+        import cadquery
+        cq = cadquery
+    return cq
+
+
+@dataclass(slots=True)
 class GFParams:
     grid_xy: float = 42.0
     grid_z: float = 7.0
@@ -28,7 +44,7 @@ def _bin_outer_dims(p: Proposal, g: GFParams) -> tuple[float, float, float]:
 
 
 def _make_bin(p: Proposal, label: str | None, options: dict, g: GFParams) -> "cq.Workplane":
-    assert cq is not None, "CadQuery is required to generate STL"
+    cq = _load_cadquery()
     x, y, z = _bin_outer_dims(p, g)
 
     wp = cq.Workplane("XY")
@@ -59,21 +75,85 @@ def _make_bin(p: Proposal, label: str | None, options: dict, g: GFParams) -> "cq
     return body
 
 
+_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def _pool() -> ProcessPoolExecutor:
+    # Why: OCCT meshing holds the GIL for long stretches; processes give real multi-core builds.
+    global _POOL
+    if _POOL is None:
+        _POOL = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),  # why: forking a threaded server is unsafe
+            initializer=_init_worker,
+        )
+    return _POOL
+
+
+def shutdown_pool() -> None:
+    """Stop the build workers; called from the app lifespan on shutdown."""
+    global _POOL
+    if _POOL is not None:
+        # Why: queued builds are for requests that are already gone; don't block exit on them.
+        _POOL.shutdown(wait=False, cancel_futures=True)
+        _POOL = None
+
+
+def _init_worker() -> None:
+    # Pay the CadQuery import once per child, not on the first build it serves.
+    _load_cadquery()
+
+
+def _build_stl(p: Proposal, label: str | None, options: dict, g: GFParams, fp: Path) -> None:
+    solid = _make_bin(p, label, options, g)
+    # write-then-rename so readers never see a partial file; the temp name is
+    # per-writer so two builds of the same file can't write into one inode
+    fd, tmp = tempfile.mkstemp(dir=fp.parent, prefix=fp.stem, suffix=".part")
+    os.close(fd)
+    try:
+        _load_cadquery().exporters.export(solid, tmp, exportType="STL")
+        os.replace(tmp, fp)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+_INFLIGHT: Dict[str, Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
+def _build_once(key: str, *args) -> None:
+    """Run `_build_stl` in the pool, sharing one build among concurrent identical requests."""
+    with _INFLIGHT_LOCK:
+        fut = _INFLIGHT.get(key)
+        if fut is None:
+            fut = _pool().submit(_build_stl, *args)
+            _INFLIGHT[key] = fut
+            fut.add_done_callback(lambda _f: _INFLIGHT.pop(key, None))
+    fut.result()
+
+
+def _request_key(req: STLRequest, g: GFParams) -> str:
+    payload = {"req": req.model_dump(), "params": asdict(g)}
+    return hashlib.blake2b(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()[:16]
+
+
 def generate_stl_files(req: STLRequest, output_dir: Path) -> List[STLFile]:
+    """Build (or reuse) the STL for a proposal. Blocking; call from a worker thread."""
     output_dir.mkdir(parents=True, exist_ok=True)
     g = GFParams()
 
     stl_files: List[STLFile] = []
     name_base = f"{req.item_id}_{req.proposal.type}_{req.proposal.x_slots}x{req.proposal.y_slots}x{req.proposal.z_units}"
-    filename = f"{name_base}.stl"
+    filename = f"{name_base}_{_request_key(req, g)}.stl"
     fp = output_dir / filename
 
-    if cq is None:
+    if not CADQUERY_AVAILABLE:
         # Fallback: write a placeholder file (why: allow API contract even without CadQuery)
         fp.write_text("CadQuery not available; this is a placeholder.")
-    else:
-        solid = _make_bin(req.proposal, req.label, req.options, g)
-        cq.exporters.export(solid, str(fp))
+    elif not fp.exists():
+        # Identical requests hash to the same file, so only the first one pays for CadQuery.
+        _build_once(filename, req.proposal, req.label, req.options, g, fp)
 
     stl_files.append(STLFile(type=req.proposal.type, url=f"/files/stl/{filename}"))
     return stl_files
@@ -17,15 +17,25 @@ Requires:
 Notes:
     - Only comment on *why*, keep code self-explanatory.
     - Dimensions are in millimeters.
+    - Plain bins (no compartments or cutouts) export via `fast_stl` without OCCT.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
 from typing import Iterable, List, Literal, Optional, Tuple
+import contextlib
+import functools
+import hashlib
+import multiprocessing
+import os
 import sys
+import tempfile
 import pathlib
 from pathlib import Path
 
+import numpy as np
+
 try:
     import cadquery as cq  # type: ignore
 except Exception as exc:
@@ -34,12 +44,14 @@ except Exception as exc:
         "CadQuery is required. Install with `pip install cadquery` or use CQ-editor."
     ) from exc
 
+from . import fast_stl
+
 # ---- Canonical Gridfinity constants ----
 GF_SLOT = 42.0  # mm (X/Y)
 GF_Z = 7.0      # mm (Z height unit)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ContainerConfig:
     """Configuration for a Gridfinity container.
 
@@ -50,7 +62,7 @@ class ContainerConfig:
     Clearances and walling:
         wall_thickness: exterior wall thickness
         floor_thickness: bottom floor thickness
-        inner_fillet: radius for internal edges
+        inner_fillet: radius for internal edges (accepted but not modelled yet)
         outer_fillet: radius for outer vertical edges
 
     Options:
@@ -102,18 +114,26 @@ class ContainerConfig:
 
     # Finger cutouts: (side, width, depth, height)
     # side in {"+x", "-x", "+y", "-y"}
-    finger_cutouts: List[Tuple[Literal['+x','-x','+y','-y'], float, float, float]] = field(
-        default_factory=list
-    )
+    finger_cutouts: Tuple[Tuple[Literal['+x','-x','+y','-y'], float, float, float], ...] = ()
 
     # Custom cutouts
     clearance: float = 0.3
-    circles: List[Tuple[float, float, float]] = field(default_factory=list)  # x,y,diam
-    rects: List[Tuple[float, float, float, float, float]] = field(default_factory=list)  # x,y,w,h,r
+    circles: Tuple[Tuple[float, float, float], ...] = ()  # x,y,diam
+    rects: Tuple[Tuple[float, float, float, float, float], ...] = ()  # x,y,w,h,r
 
     # Export
     export_resolution: float = 0.1  # STL linear deflection
 
+    def __post_init__(self) -> None:
+        # Why: frozen + tuples makes configs hashable, so identical requests share builds.
+        object.__setattr__(self, "compartments", tuple(self.compartments))
+        for name in ("finger_cutouts", "circles", "rects"):
+            object.__setattr__(self, name, tuple(tuple(v) for v in getattr(self, name)))
+
+    def cache_key(self) -> str:
+        """Stable short hash of every field; used to name cached exports."""
+        return hashlib.blake2b(repr(self).encode(), digest_size=8).hexdigest()
+
     def validate(self) -> None:
         if self.x_slots < 1 or self.y_slots < 1 or self.z_units < 1:
             raise ValueError("x/y/z must be >= 1 unit")
@@ -144,9 +164,44 @@ class GridfinityContainerGenerator:
     def __init__(self, cfg: ContainerConfig):
         cfg.validate()
         self.cfg = cfg
+        # Derived sizes, read by every builder step.
+        self._ox, self._oy = cfg.outer_size()
+        self._ix, self._iy = cfg.inner_size()
+        self._h = cfg.outer_height()
+        self._cav = cfg.cavity_height()
 
     # ---- Public API ----
     def build(self) -> cq.Workplane:
+        # Why: the cached Workplane is shared across threads; OCCT meshing writes into
+        # the shape, so hand out copies (without the mesh) and keep the cache read-only.
+        cached = _build_cached(self.cfg)
+        return cached.newObject([obj.copy() for obj in cached.vals()])
+
+    def export_cached(self, out_dir: str | Path) -> Path:
+        """Export to `<out_dir>/<cache_key>.stl`, reusing the file if it is already there."""
+        out = Path(out_dir) / f"{self.cfg.cache_key()}.stl"
+        if out.exists():
+            # Why: refresh mtime so age-based temp cleanup doesn't reap hot entries.
+            os.utime(out)
+            return out
+        out.parent.mkdir(parents=True, exist_ok=True)
+        # Why: each writer gets its own temp file; a shared ".part" path lets concurrent
+        # builders of the same key write into one inode and lose the rename race.
+        fd, part = tempfile.mkstemp(dir=out.parent, prefix=out.stem, suffix=".part")
+        os.close(fd)
+        try:
+            self.export_stl(part)
+            try:
+                os.replace(part, out)  # readers never see a half file
+            except OSError:
+                if not out.exists():  # an identical build already landed it
+                    raise
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(part)
+        return out
+
+    def _build(self) -> cq.Workplane:
         body = self._make_shell()
         body = self._add_lip(body)
         body = self._add_underside(body)
@@ -155,20 +210,34 @@ class GridfinityContainerGenerator:
         body = self._add_custom_cutouts(body)
         return body
 
-    def export_stl(self, path: str | pathlib.Path) -> pathlib.Path:
+    def export_stl(self, path: str | pathlib.Path, *, fast: bool = True) -> pathlib.Path:
+        if fast and fast_stl.is_simple(self.cfg):
+            # Why: plain bins are closed-form; skip the BRep booleans and OCCT's mesher.
+            return fast_stl.write_stl(fast_stl.bin_triangles(self.cfg), path)
         solid = self.build()
         out = pathlib.Path(path)
         out.parent.mkdir(parents=True, exist_ok=True)
-        cq.exporters.export(solid.val(), str(out), tolerance=self.cfg.export_resolution)
+        # exportType is explicit: export_cached writes to a ".part" temp name.
+        cq.exporters.export(solid.val(), str(out), exportType="STL", tolerance=self.cfg.export_resolution)
         return out
 
     def export_with_preview(self, stl_path: str | Path, png_path: str | Path, *, elev: int = 25, azim: int = 45, dpi: int = 220) -> tuple[Path, Path]:
-        """Export STL and a simple PNG preview (matplotlib + numpy-stl).
+        """Export STL and a simple PNG preview (NumPy rasterizer).
         Why: Give the API a quick thumbnail without requiring OpenGL.
         """
-        stl_p = self.export_stl(stl_path)
+        # Why: one tessellation feeds both outputs. Plain bins hand their triangles
+        # straight to the renderer; BRep bins are meshed once and the STL is read back.
+        if fast_stl.is_simple(self.cfg):
+            vectors = fast_stl.bin_triangles(self.cfg)
+            stl_p = fast_stl.write_stl(vectors, stl_path)
+        else:
+            stl_p = self.export_stl(stl_path, fast=False)
+            vectors = None
         try:
-            render_stl_preview_png(stl_p, png_path, elev=elev, azim=azim, dpi=dpi)
+            if vectors is None:
+                render_stl_preview_png(stl_p, png_path, elev=elev, azim=azim, dpi=dpi)
+            else:
+                render_preview_png(vectors, png_path, elev=elev, azim=azim, dpi=dpi)
         except Exception as exc:
             # Don't fail export if preview rendering fails; surface context.
             raise RuntimeError(f"Preview render failed: {exc}") from exc
@@ -177,120 +246,94 @@ class GridfinityContainerGenerator:
     # ---- Builders ----
     def _make_shell(self) -> cq.Workplane:
         cfg = self.cfg
-        ox, oy = cfg.outer_size()
-        h = cfg.outer_height()
-        # Base rectangle
-        base = (
-            cq.Workplane("XY")
-            .rect(ox, oy)
-            .extrude(h)
-        )
-        # Hollow interior
-        ix, iy = cfg.inner_size()
+        ox, oy, h = self._ox, self._oy, self._h
+        # Why: rounding the 2D outline replaces a 3D edge fillet, and placing the
+        # cavity absolutely needs no edge/face selection on the solid at all.
+        outline = cq.Sketch().rect(ox, oy)
+        if 0 < cfg.outer_fillet < min(ox, oy) / 2:
+            try:
+                outline = cq.Sketch().rect(ox, oy).vertices().fillet(cfg.outer_fillet)
+            except Exception:
+                pass
+        base = cq.Workplane("XY").placeSketch(outline).extrude(h)
         cavity = (
             cq.Workplane("XY")
-            .rect(ix, iy)
             .workplane(offset=cfg.floor_thickness)
-            .extrude(cfg.cavity_height(), combine=False)
+            .rect(self._ix, self._iy)
+            .extrude(self._cav)
         )
-        shell = base.cut(cavity)
-        # Fillets for printability
-        if cfg.outer_fillet > 0:
-            try:
-                shell = shell.edges("|Z and >Y or |Z and <Y or |Z and >X or |Z and <X").fillet(cfg.outer_fillet)
-            except Exception:
-                pass
-        if cfg.inner_fillet > 0:
-            try:
-                shell = shell.faces(">")  # top face
-                # Why: apply small top inner fillet by offsetting a thin cut and filleting edges is complex; skip.
-                shell = shell.parent  # no-op placeholder for inner fillet simplicity
-            except Exception:
-                pass
-        return shell
+        return base.cut(cavity)
 
     def _add_lip(self, wp: cq.Workplane) -> cq.Workplane:
         cfg = self.cfg
         if not cfg.lip:
             return wp
-        ox, oy = cfg.outer_size()
+        ox, oy = self._ox, self._oy
         # Subtractive lip: nibble the top inside perimeter to create an inward step
         lip_wp = (
             cq.Workplane("XY")
+            .workplane(offset=self._h - cfg.lip_height)
             .rect(ox - 2 * cfg.lip_depth, oy - 2 * cfg.lip_depth)
-            .workplane(offset=cfg.outer_height() - cfg.lip_height)
             .extrude(cfg.lip_height)
         )
         return wp.cut(lip_wp)
 
-    def _add_underside(self, wp: cq.Workplane) -> cq.Workplane:
+    @functools.cached_property
+    def _hole_points(self) -> Tuple[Tuple[float, float], ...]:
+        """Four positions near the corners, shared by magnet and screw bores."""
         cfg = self.cfg
-        if not (cfg.magnets or cfg.screws):
-            return wp
-        ox, oy = cfg.outer_size()
-        # Four positions near corners
-        pts = [
+        ox, oy = self._ox, self._oy
+        return tuple(
             (sx * (ox / 2 - cfg.magnet_edge_margin), sy * (oy / 2 - cfg.magnet_edge_margin))
             for sx in (-1, 1)
             for sy in (-1, 1)
-        ]
-        # Why: Create holes on the bin's actual bottom face; previous approach
-        # attempted to call .hole() on an empty Workplane, which CadQuery rejects
-        # when multiple points are present.
+        )
+
+    def _add_underside(self, wp: cq.Workplane) -> cq.Workplane:
+        cfg = self.cfg
+        bores: List[Tuple[float, float]] = []
         if cfg.magnets:
-            wp = (
-                wp
-                .faces("<Z").workplane(centerOption="CenterOfMass")
-                .pushPoints(pts)
-                .hole(cfg.magnet_diameter, depth=cfg.magnet_thickness)
-            )
+            bores.append((cfg.magnet_diameter, cfg.magnet_thickness))
         if cfg.screws:
-            wp = (
-                wp
-                .faces("<Z").workplane(centerOption="CenterOfMass")
-                .pushPoints(pts)
-                .hole(cfg.screw_diameter, depth=cfg.outer_height())
-            )
-        return wp
+            bores.append((cfg.screw_diameter, self._h))
+        if not bores:
+            return wp
+        # Why: the bottom face sits at z=0, so cylinders placed absolutely and drilled
+        # upward match .hole() without a face selection, and one cut replaces 4-8 holes.
+        cylinders = [
+            cq.Workplane(obj=cq.Solid.makeCylinder(d / 2, depth, cq.Vector(x, y, 0), cq.Vector(0, 0, 1)))
+            for d, depth in bores
+            for x, y in self._hole_points
+        ]
+        return wp.cut(_tools(cylinders))
 
     def _add_compartments(self, wp: cq.Workplane) -> cq.Workplane:
         cfg = self.cfg
         cx, cy = cfg.compartments
         if (cx, cy) == (1, 1):
             return wp
-        ix, iy = cfg.inner_size()
+        ix, iy = self._ix, self._iy
         # Grid lines positions (excluding outer walls)
         x_lines = [(-ix / 2) + i * (ix / cx) for i in range(1, cx)]
         y_lines = [(-iy / 2) + j * (iy / cy) for j in range(1, cy)]
-        height = cfg.cavity_height() - (cfg.lip_height if cfg.lip else 0.0)
-        # Internal walls as positive solids unioned to body
-        walls: List[cq.Workplane] = []
-        for x in x_lines:
-            walls.append(
-                cq.Workplane("XY")
-                .center(x, 0)
-                .rect(cfg.comp_wall, iy)
-                .extrude(height)
-            )
-        for y in y_lines:
-            walls.append(
-                cq.Workplane("XY")
-                .center(0, y)
-                .rect(ix, cfg.comp_wall)
-                .extrude(height)
-            )
-        if walls:
-            wp = wp.union(walls[0]) if walls else wp
-            for w in walls[1:]:
-                wp = wp.union(w)
-        return wp
+        height = self._cav - (cfg.lip_height if cfg.lip else 0.0)
+        # Why: fuse the wall grid in 2D so a single extrusion and one union
+        # replace a solid plus a 3D boolean per wall.
+        grid = cq.Sketch()
+        if x_lines:
+            grid = grid.push([(x, 0) for x in x_lines]).rect(cfg.comp_wall, iy).reset()
+        if y_lines:
+            grid = grid.push([(0, y) for y in y_lines]).rect(ix, cfg.comp_wall).reset()
+        walls = cq.Workplane("XY").workplane(offset=cfg.floor_thickness).placeSketch(grid).extrude(height)
+        # Why: walls only touch the shell on shared faces (floor, inner walls), never
+        # overlap it, so the glue fuse can skip the general intersection pass.
+        return wp.union(walls, glue=True)
 
     def _add_finger_cutouts(self, wp: cq.Workplane) -> cq.Workplane:
         cfg = self.cfg
         if not cfg.finger_cutouts:
             return wp
-        ox, oy = cfg.outer_size()
-        h = cfg.outer_height()
+        ox, oy, h = self._ox, self._oy, self._h
         cuts: List[cq.Workplane] = []
         for side, width, depth, height in cfg.finger_cutouts:
             w = max(1e-3, width)
@@ -300,108 +343,253 @@ class GridfinityContainerGenerator:
                 x = (ox / 2) * (1 if side == "+x" else -1)
                 cut = (
                     cq.Workplane("XY")
+                    .workplane(offset=z0)
                     .center(x - (d if side == "+x" else -d) / 2, 0)
                     .rect(d, w)
-                    .workplane(offset=z0)
                     .extrude(height)
                 )
             else:
                 y = (oy / 2) * (1 if side == "+y" else -1)
                 cut = (
                     cq.Workplane("XY")
+                    .workplane(offset=z0)
                     .center(0, y - (d if side == "+y" else -d) / 2)
                     .rect(w, d)
-                    .workplane(offset=z0)
                     .extrude(height)
                 )
             cuts.append(cut)
-        for c in cuts:
-            wp = wp.cut(c)
-        return wp
+        return wp.cut(_tools(cuts))
 
     def _add_custom_cutouts(self, wp: cq.Workplane) -> cq.Workplane:
         cfg = self.cfg
         if not (cfg.circles or cfg.rects):
             return wp
-        h = cfg.outer_height()
+        h = self._h
         usable_h = h - (cfg.lip_height if cfg.lip else 0.0)
-        # Circles
-        if cfg.circles:
-            # Build per-circle to honor individual diameters.
-            for (x, y, d) in cfg.circles:
-                wp = wp.cut(
-                    cq.Workplane("XY")
-                    .center(x, y)
-                    .circle((d + 2 * cfg.clearance) / 2.0)
-                    .workplane(offset=cfg.floor_thickness)
-                    .extrude(usable_h)
-                )
+        cutters: List[cq.Workplane] = []
+        # Circles: one tool each to honor individual diameters.
+        for (x, y, d) in cfg.circles:
+            cutters.append(
+                cq.Workplane("XY")
+                .workplane(offset=cfg.floor_thickness)
+                .center(x, y)
+                .circle((d + 2 * cfg.clearance) / 2.0)
+                .extrude(usable_h)
+            )
         # Rectangles with optional corner radius r
         for (x, y, w, r_h, r) in cfg.rects:
-            wp = wp.cut(
+            cutters.append(
                 cq.Workplane("XY")
+                .workplane(offset=cfg.floor_thickness)
                 .center(x, y)
                 .rect(w + 2 * cfg.clearance, r_h + 2 * cfg.clearance, forConstruction=False)
-                .workplane(offset=cfg.floor_thickness)
                 .extrude(usable_h)
             )
             if r > 0:
                 # Why: Rounded rectangles require sketch filleting; CQ's `rect` with radius is limited across versions.
                 pass
-        return wp
+        # Why: a single multi-tool cut runs one OCCT pave-filler instead of one per cutter.
+        return wp.cut(_tools(cutters))
+
+
+def _tools(parts: Iterable[cq.Workplane]) -> cq.Workplane:
+    """Stack standalone tool solids so one boolean takes them all as arguments.
+
+    Why: a single Compound would be treated as one (self-overlapping) tool,
+    double-counting where walls cross; separate arguments are intersected properly.
+    """
+    return cq.Workplane("XY").add([p.val() for p in parts])
+
+
+@functools.lru_cache(maxsize=64)
+def _build_cached(cfg: ContainerConfig) -> cq.Workplane:
+    return GridfinityContainerGenerator(cfg)._build()
+
+
+def _export_worker(cfg: ContainerConfig, out_dir: str) -> Path:
+    return GridfinityContainerGenerator(cfg).export_cached(out_dir)
+
+
+def build_many(
+    configs: Iterable[ContainerConfig], out_dir: str | Path, *, max_workers: Optional[int] = None
+) -> List[Path]:
+    """Export every config to `out_dir` in parallel; returns paths in input order.
+
+    Files are content-addressed via `export_cached`, so duplicates (and anything
+    already on disk) are built once.
+    """
+    configs = list(configs)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    unique = list(dict.fromkeys(configs))
+    if len(unique) <= 1 or max_workers == 1:
+        built = [_export_worker(cfg, str(out_dir)) for cfg in unique]
+    else:
+        # Why: OCCT shapes aren't safe to share across threads; separate processes scale
+        # near-linearly. Spawn, because forking a process that already loaded OCCT is unsafe.
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers or os.cpu_count() or 1, len(unique)),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as ex:
+            built = list(ex.map(_export_worker, unique, [str(out_dir)] * len(unique)))
+    by_cfg = dict(zip(unique, built))
+    return [by_cfg[cfg] for cfg in configs]
 
 
 # ---- Preview helper (headless) ----
 
 def render_stl_preview_png(stl_path: str | Path, out_png: str | Path, *, elev: int = 25, azim: int = 45, dpi: int = 220) -> Path:
-    """Render a basic shaded PNG from an STL using matplotlib (no OpenGL).
+    """Render a basic shaded PNG from an STL with a NumPy rasterizer (no OpenGL).
     Notes:
-      - Requires `numpy-stl` and `matplotlib`.
+      - Binary STL is read directly; ASCII STL needs `numpy-stl`.
+      - Pillow is used to encode the PNG when installed.
       - Not photo-realistic, but fast and headless-friendly for thumbnails.
     """
+    vectors = fast_stl.read_stl(stl_path)
+    if vectors is not None:
+        return render_preview_png(vectors, out_png, elev=elev, azim=azim, dpi=dpi)
     try:
         from stl import mesh  # pyright: ignore[reportMissingImports]  # numpy-stl
-        import matplotlib
-        matplotlib.use("Agg")  # headless
-        import matplotlib.pyplot as plt
-        from mpl_toolkits.mplot3d.art3d import Poly3DCollection
     except Exception as exc:
         raise RuntimeError(
-            "Preview requires numpy-stl and matplotlib. Install: pip install numpy-stl matplotlib"
+            "ASCII STL preview requires numpy-stl. Install: pip install numpy-stl"
         ) from exc
 
     m = mesh.Mesh.from_file(str(stl_path))
-    vectors = m.vectors  # (N, 3, 3)
-
-    fig = plt.figure(figsize=(4, 4), dpi=dpi)
-    ax = fig.add_subplot(111, projection="3d")
-
-    # Mesh collection
-    collection = Poly3DCollection(vectors, alpha=1.0, linewidths=0.1)
-    collection.set_edgecolor((0, 0, 0, 0.15))  # subtle edges for definition
-    ax.add_collection3d(collection)
-
-    # Fit axes to mesh
-    pts = vectors.reshape(-1, 3)
-    mins = pts.min(axis=0)
-    maxs = pts.max(axis=0)
-    center = (mins + maxs) / 2.0
-    size = (maxs - mins).max()
-    r = size * 0.6
-    ax.set_xlim(center[0] - r, center[0] + r)
-    ax.set_ylim(center[1] - r, center[1] + r)
-    ax.set_zlim(center[2] - r, center[2] + r)
-
-    ax.view_init(elev=elev, azim=azim)
-    ax.set_axis_off()
-    fig.tight_layout(pad=0)
+    return render_preview_png(m.vectors, out_png, elev=elev, azim=azim, dpi=dpi)
+
+
+_PREVIEW_RGB = np.array([31, 119, 180], dtype=np.float32)  # matplotlib "C0", as before
+# Key light in view space: above and to the left of the camera, so walls and floors separate.
+_PREVIEW_LIGHT = np.array([-0.35, 0.55, 0.76], dtype=np.float32) / np.float32(np.linalg.norm([-0.35, 0.55, 0.76]))
+_RASTER_CHUNK = 4_000_000  # candidate pixels per pass; bounds peak memory
+
+
+def render_preview_png(vectors, out_png: str | Path, *, elev: int = 25, azim: int = 45, dpi: int = 220) -> Path:
+    """Render an (N, 3, 3) triangle array to PNG; shared by STL files and in-memory meshes.
+
+    Orthographic z-buffer rasterizer in NumPy, drawn at 2x and box-filtered down.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    size = int(4 * dpi)  # same 4in canvas the matplotlib renderer used
+    ss = 2
+    px = size * ss
+
+    e, a = np.radians(elev), np.radians(azim)
+    view = np.array(
+        [
+            [-np.sin(a), np.cos(a), 0.0],
+            [-np.sin(e) * np.cos(a), -np.sin(e) * np.sin(a), np.cos(e)],
+            [np.cos(e) * np.cos(a), np.cos(e) * np.sin(a), np.sin(e)],
+        ],
+        dtype=np.float32,
+    )
+    # One (3, 3) @ (3, N*3) product moves every vertex into view space.
+    tri = (view @ vectors.reshape(-1, 3).T).T.reshape(-1, 3, 3)
+    # Frame the projected silhouette, with a small margin, whatever the view angle.
+    flat_xy = tri[:, :, :2].reshape(-1, 2)
+    center = (flat_xy.min(axis=0) + flat_xy.max(axis=0)) / 2.0
+    r = max(float((flat_xy.max(axis=0) - flat_xy.min(axis=0)).max()) * 0.55, 1e-6)
+    tri[:, :, :2] -= center
+
+    # Why: back faces are never visible on a closed mesh, so cull them before rasterizing.
+    normals = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    normals /= np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+    front = normals[:, 2] > 1e-6
+    tri = tri[front]
+    shade = 0.35 + 0.65 * np.clip(normals[front] @ _PREVIEW_LIGHT, 0.0, 1.0)
+
+    # Screen space: x right, y down, depth grows toward the camera.
+    scale = px / (2.0 * r)
+    sx = (tri[:, :, 0].astype(np.float64) + r) * scale
+    sy = (r - tri[:, :, 1].astype(np.float64)) * scale
+    depth = tri[:, :, 2].astype(np.float64)
+    # Depth is linear over each triangle: z = za*x + zb*y + zc in screen space.
+    ux, uy, uz = sx[:, 1] - sx[:, 0], sy[:, 1] - sy[:, 0], depth[:, 1] - depth[:, 0]
+    vx, vy, vz = sx[:, 2] - sx[:, 0], sy[:, 2] - sy[:, 0], depth[:, 2] - depth[:, 0]
+    area = ux * vy - uy * vx
+    area = np.where(np.abs(area) < 1e-12, 1e-12, area)
+    za = -(uy * vz - uz * vy) / area
+    zb = -(uz * vx - ux * vz) / area
+    zc = depth[:, 0] - za * sx[:, 0] - zb * sy[:, 0]
+
+    # Why: scanline spans touch only covered pixels; bounding boxes of long
+    # sliver triangles are almost entirely empty and would dominate the cost.
+    y_lo = np.maximum(np.ceil(sy.min(axis=1) - 0.5), 0).astype(np.int64)
+    y_hi = np.minimum(np.floor(sy.max(axis=1) - 0.5), px - 1).astype(np.int64)
+    nrows = np.maximum(y_hi - y_lo + 1, 0)
+    rt = np.repeat(np.arange(len(tri)), nrows)
+    ry = y_lo[rt] + np.arange(len(rt)) - np.repeat(np.cumsum(nrows) - nrows, nrows)
+    yc = ry + 0.5
+    ex0, ey0 = sx[rt], sy[rt]
+    ex1, ey1 = np.roll(ex0, -1, axis=1), np.roll(ey0, -1, axis=1)
+    dy = ey1 - ey0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (yc[:, None] - ey0) / dy
+    crosses = (dy != 0) & (t >= 0) & (t <= 1)
+    xs = ex0 + t * (ex1 - ex0)
+    x_lo = np.maximum(np.ceil(np.where(crosses, xs, np.inf).min(axis=1) - 0.5), 0)
+    x_hi = np.minimum(np.floor(np.where(crosses, xs, -np.inf).max(axis=1) - 0.5), px - 1)
+    ncols = np.maximum(x_hi - x_lo + 1, 0).astype(np.int64)
+    x_lo = x_lo.astype(np.int64)
+
+    zbuf = np.full(px * px, -np.inf)
+    ibuf = np.full(px * px, -1, dtype=np.int64)
+    cum = np.cumsum(ncols)
+    lo = 0
+    while lo < len(rt):
+        hi = max(lo + 1, int(np.searchsorted(cum, cum[lo] - ncols[lo] + _RASTER_CHUNK, side="right")))
+        n = ncols[lo:hi]
+        ids = np.repeat(rt[lo:hi], n)
+        cy = np.repeat(ry[lo:hi], n)
+        cx = np.repeat(x_lo[lo:hi], n) + np.arange(len(ids)) - np.repeat(np.cumsum(n) - n, n)
+        z = za[ids] * (cx + 0.5) + zb[ids] * (cy + 0.5) + zc[ids]
+        flat = cy * px + cx
+        np.maximum.at(zbuf, flat, z)
+        win = z >= zbuf[flat]
+        ibuf[flat[win]] = ids[win]
+        lo = hi
+
+    hit = ibuf >= 0
+    rgba = np.zeros((px * px, 4), dtype=np.float32)
+    rgba[hit, :3] = shade[ibuf[hit], None] * _PREVIEW_RGB
+    rgba[hit, 3] = 255.0
+    rgba = rgba.reshape(size, ss, size, ss, 4).mean(axis=(1, 3))
+    # Un-premultiply so anti-aliased silhouette pixels keep the mesh colour.
+    alpha = rgba[..., 3:]
+    rgba[..., :3] = np.where(alpha > 0, rgba[..., :3] * 255.0 / np.maximum(alpha, 1e-6), 0.0)
+    image = np.clip(rgba + 0.5, 0, 255).astype(np.uint8)
 
     out = Path(out_png)
     out.parent.mkdir(parents=True, exist_ok=True)
-    fig.savefig(out, transparent=True, bbox_inches="tight", pad_inches=0)
-    plt.close(fig)
+    _write_png(image, out)
     return out
 
+
+def _write_png(rgba: np.ndarray, path: Path) -> None:
+    try:
+        from PIL import Image  # type: ignore
+    except Exception:
+        Image = None
+    if Image is not None:
+        Image.fromarray(rgba, "RGBA").save(path)
+        return
+    # Why: keep previews working without Pillow; an unfiltered RGBA PNG is a few lines of zlib.
+    import struct
+    import zlib
+
+    h, w = rgba.shape[:2]
+    raw = np.concatenate([np.zeros((h, 1), dtype=np.uint8), rgba.reshape(h, -1)], axis=1).tobytes()
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    with open(path, "wb") as fh:
+        fh.write(b"\x89PNG\r\n\x1a\n")
+        fh.write(chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 6, 0, 0, 0)))
+        fh.write(chunk(b"IDAT", zlib.compress(raw, 6)))
+        fh.write(chunk(b"IEND", b""))
+
 # ---- CLI ----
 import argparse
 
@@ -520,7 +708,8 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
     if args.demo:
         # Simple demo: 2x2, finger cutouts on +x and -x
         demo_out = pathlib.Path("demo.stl")
-        gen.cfg.finger_cutouts = gen.cfg.finger_cutouts or [("+x", 24, 10, 12), ("-x", 24, 10, 12)]
+        if not cfg.finger_cutouts:
+            gen = GridfinityContainerGenerator(replace(cfg, finger_cutouts=[("+x", 24, 10, 12), ("-x", 24, 10, 12)]))
         gen.export_stl(demo_out)
         print(f"Exported {demo_out.resolve()}")
         return 0
@@ -0,0 +1,367 @@
+"""backend/cad/fast_stl.py
+
+Direct triangle-mesh STL for plain Gridfinity bins (no OCCT).
+
+A bin without compartments or cutouts is a rounded-rect shell with a
+rectangular cavity, an optional lip step and four corner holes. That is
+cheap to tessellate analytically, so it skips the BRep build, the booleans
+and OCCT's mesher entirely.
+
+Only quadrant +X/+Y is built; the rest is mirrored. Every horizontal face
+is triangulated on its own and the vertical walls are zipped between the
+boundary vertices of the faces they join, so the mesh stays watertight
+without T-junctions.
+
+Notes:
+    - Only comment on *why*, keep code self-explanatory.
+    - Dimensions are in millimeters.
+"""
+from __future__ import annotations
+
+import math
+import os
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+CIRCLE_SEGMENTS = 32  # multiple of 4 keeps the angle set mirror-symmetric
+ARC_SEGMENTS = 8  # per 90 degree outer fillet
+
+# Binary STL record layout; reused by readers so both sides agree on the format.
+STL_DTYPE = np.dtype([("normal", "<f4", (3,)), ("vectors", "<f4", (3, 3)), ("attr", "<u2")])
+
+Pt = Tuple[float, float]
+_EPS = 1e-9
+
+
+def is_simple(cfg: Any) -> bool:
+    """True when `cfg` is a plain bin the analytic mesher reproduces exactly."""
+    if tuple(cfg.compartments) != (1, 1) or cfg.circles or cfg.rects or cfg.finger_cutouts:
+        return False
+    ox, oy = cfg.outer_size()
+    wall, r = cfg.wall_thickness, max(cfg.outer_fillet, 0.0)
+    # Why: outside these bounds CadQuery's fillet/hole ops fail or interact; let OCCT decide.
+    if r >= wall or cfg.floor_thickness <= 0 or wall <= 0:
+        return False
+    # The rim is meshed radially, so the lip/cavity corner must sit inside the fillet.
+    rim = cfg.lip_depth if _lip_active(cfg) else wall
+    if rim < r and math.sqrt(2) * (r - rim) >= r:
+        return False
+    if _lip_active(cfg) and cfg.lip_height >= cfg.cavity_height():
+        return False
+    if cfg.magnets or cfg.screws:
+        m = cfg.magnet_edge_margin
+        bottom_r, floor_r = _hole_radii(cfg)
+        if m - bottom_r <= r or m + bottom_r >= min(ox, oy) / 2:
+            return False
+        if floor_r and m - floor_r <= wall:
+            return False
+        if cfg.magnets and cfg.screws and cfg.screw_diameter >= cfg.magnet_diameter:
+            return False
+    return True
+
+
+def _magnets_through(cfg: Any) -> bool:
+    # A pocket reaching the floor top opens into the cavity (the default 2 mm / 2 mm case).
+    return bool(cfg.magnets) and cfg.magnet_thickness >= cfg.floor_thickness
+
+
+def _hole_radii(cfg: Any) -> Tuple[float, float]:
+    """Hole radius at the bin bottom and at the cavity floor (0 for none)."""
+    rm = cfg.magnet_diameter / 2 if cfg.magnets else 0.0
+    rs = cfg.screw_diameter / 2 if cfg.screws else 0.0
+    return rm or rs, rm if _magnets_through(cfg) else rs
+
+
+def _lip_active(cfg: Any) -> bool:
+    # A lip no wider than the wall only removes cavity air.
+    return bool(cfg.lip) and 0 < cfg.lip_depth < cfg.wall_thickness and cfg.lip_height > 0
+
+
+def bin_triangles(cfg: Any) -> np.ndarray:
+    """(N, 3, 3) float32 triangles, CCW seen from outside, for a simple bin."""
+    quad = _quadrant(cfg)
+    mirrored = [quad]
+    for sx, sy in ((-1, 1), (1, -1), (-1, -1)):
+        m = quad * np.array([sx, sy, 1.0])
+        if sx * sy < 0:
+            m = m[:, ::-1]  # single reflection flips winding
+        mirrored.append(m)
+    return np.concatenate(mirrored).astype(np.float32)
+
+
+def write_stl(triangles: np.ndarray, path: str | Path) -> Path:
+    """Write binary STL in one buffer."""
+    tri = np.asarray(triangles, dtype=np.float32)
+    normals = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    records = np.zeros(len(tri), dtype=STL_DTYPE)
+    records["normal"] = normals / np.where(lengths == 0, 1, lengths)
+    records["vectors"] = tri
+    out = Path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with out.open("wb") as f:
+        f.write(b"gridfinity fast_stl".ljust(80, b"\0"))
+        f.write(np.uint32(len(tri)).tobytes())
+        f.write(records.tobytes())
+    return out
+
+
+def read_stl(path: str | Path) -> Optional[np.ndarray]:
+    """(N, 3, 3) triangles from a binary STL, or None if the file isn't binary STL.
+
+    Why: the records are fixed-size, so one structured read replaces per-facet parsing.
+    """
+    with open(path, "rb") as f:
+        f.seek(80)
+        head = f.read(4)
+        if len(head) < 4:
+            return None
+        n = int(np.frombuffer(head, dtype="<u4")[0])
+        # ASCII files ("solid ...") won't match the size implied by the record count.
+        if os.fstat(f.fileno()).st_size != 84 + n * STL_DTYPE.itemsize:
+            return None
+        records = np.fromfile(f, dtype=STL_DTYPE, count=n)
+    return records["vectors"]
+
+
+# ---- Quadrant builder ----
+
+def _quadrant(cfg: Any) -> np.ndarray:
+    ox, oy = cfg.outer_size()
+    h = cfg.outer_height()
+    X, Y = ox / 2, oy / 2
+    wall, floor = cfg.wall_thickness, cfg.floor_thickness
+    IX, IY = X - wall, Y - wall
+    lip = _lip_active(cfg)
+    lip_z = h - cfg.lip_height if lip else h
+    c = (X - cfg.magnet_edge_margin, Y - cfg.magnet_edge_margin)
+    bottom_r, floor_r = _hole_radii(cfg)
+    rs = cfg.screw_diameter / 2 if cfg.screws else 0.0
+    t = cfg.magnet_thickness
+
+    outer = _outer_polyline(X, Y, max(cfg.outer_fillet, 0.0))
+    inner = [(IX, 0.0), (IX, IY), (0.0, IY)]
+    top_inner = [(X - cfg.lip_depth, 0.0), (X - cfg.lip_depth, Y - cfg.lip_depth), (0.0, Y - cfg.lip_depth)] if lip else inner
+
+    tris: List[np.ndarray] = []
+    up, down = np.array([0, 0, 1.0]), np.array([0, 0, -1.0])
+
+    # Top rim, and the lip step below it.
+    top_out, top_in = _radial_band(outer, top_inner)
+    tris.append(_orient(_band(top_out, top_in, h, h), up))
+    if lip:
+        step_out, step_in = _radial_band(top_inner, inner)
+        tris.append(_orient(_band(step_out, step_in, lip_z, lip_z), up))
+        tris.append(_orient(_zip(step_out, lip_z, top_in, h), _toward_origin))
+        cavity_top = step_in
+    else:
+        cavity_top = top_in
+
+    # Bottom face (holed by the magnet bore, else the screw hole).
+    bottom_loop, bottom_circle = _holed_face([(0.0, 0.0), *outer], c, bottom_r, 0.0, down, tris)
+    tris.append(_orient(_zip(_on_polyline(bottom_loop, outer), 0.0, top_out, h), _away_from_origin))
+
+    # Cavity floor (holed by the screw or a through magnet bore) and cavity walls.
+    floor_loop, floor_circle = _holed_face([(0.0, 0.0), *inner], c, floor_r, floor, up, tris)
+    tris.append(_orient(_zip(_on_polyline(floor_loop, inner), floor, cavity_top, lip_z), _toward_origin))
+
+    # Hole walls.
+    into_hole = _toward(c)
+    if cfg.magnets and not _magnets_through(cfg):
+        ceiling = _circle(c, bottom_r, _uniform())
+        if cfg.screws:
+            screw_ring = _circle(c, rs, _uniform())
+            tris.append(_orient(_band(ceiling + ceiling[:1], screw_ring + screw_ring[:1], t, t), down))
+            tris.append(_orient(_zip_closed(screw_ring, t, floor_circle, floor, c), into_hole))
+        else:
+            tris.append(_orient(_fan(c, ceiling, t, closed=True), down))
+        tris.append(_orient(_zip_closed(bottom_circle, 0.0, ceiling, t, c), into_hole))
+    elif bottom_r:
+        tris.append(_orient(_zip_closed(bottom_circle, 0.0, floor_circle, floor, c), into_hole))
+
+    return np.concatenate([tr for tr in tris if len(tr)])
+
+
+def _outer_polyline(X: float, Y: float, r: float) -> List[Pt]:
+    if r <= 0:
+        return [(X, 0.0), (X, Y), (0.0, Y)]
+    cx, cy = X - r, Y - r
+    arc = [
+        (cx + r * math.cos(a), cy + r * math.sin(a))
+        for a in np.linspace(0.0, math.pi / 2, ARC_SEGMENTS + 1)
+    ]
+    arc[0], arc[-1] = (X, cy), (cx, Y)
+    return [(X, 0.0), *arc, (0.0, Y)]
+
+
+def _holed_face(
+    loop: List[Pt], c: Pt, radius: float, z: float, normal: np.ndarray, tris: List[np.ndarray]
+) -> Tuple[List[Pt], List[Pt]]:
+    """Triangulate the convex quadrant `loop` at height `z`, minus a circle at `c`.
+
+    Returns the boundary as actually sampled (for wall zipping) and the circle.
+    """
+    if radius <= 0:
+        tris.append(_orient(_fan(loop[0], loop[1:], z), normal))
+        return loop, []
+    angles = _uniform()
+    boundary = _sample_convex(loop, c, angles)
+    circle = _circle(c, radius, [a for a, _ in boundary])
+    pts = [p for _, p in boundary]
+    tris.append(_orient(_band(pts + pts[:1], circle + circle[:1], z, z), normal))
+    return pts, circle
+
+
+# ---- Sampling ----
+
+def _uniform() -> List[float]:
+    return [2 * math.pi * k / CIRCLE_SEGMENTS for k in range(CIRCLE_SEGMENTS)]
+
+
+def _angle(p: Pt, c: Pt = (0.0, 0.0)) -> float:
+    a = math.atan2(p[1] - c[1], p[0] - c[0])
+    return a + 2 * math.pi if a < 0 else a
+
+
+def _circle(c: Pt, r: float, angles: Sequence[float]) -> List[Pt]:
+    return [(c[0] + r * math.cos(a), c[1] + r * math.sin(a)) for a in angles]
+
+
+def _ray_hit(c: Pt, a: float, p: Pt, q: Pt) -> Pt | None:
+    """Point where the ray from `c` at angle `a` crosses segment p-q (interpolated on p-q)."""
+    dx, dy = math.cos(a), math.sin(a)
+    ex, ey = q[0] - p[0], q[1] - p[1]
+    den = dx * ey - dy * ex
+    if abs(den) < _EPS:
+        return None
+    wx, wy = p[0] - c[0], p[1] - c[1]
+    s = (wx * dy - wy * dx) / den
+    k = (wx * ey - wy * ex) / den
+    if k <= 0 or s < -_EPS or s > 1 + _EPS:
+        return None
+    # Why: interpolating along the edge keeps on-axis points exactly on the axis.
+    return (p[0] + s * ex, p[1] + s * ey)
+
+
+def _sample_convex(loop: List[Pt], c: Pt, extra: Sequence[float]) -> List[Tuple[float, Pt]]:
+    """Closed convex `loop` sampled at its own vertices plus rays from `c` at `extra` angles,
+    sorted by angle around `c` starting at 0."""
+    samples = [(_angle(p, c), p) for p in loop]
+    taken = [a for a, _ in samples]
+    edges = list(zip(loop, loop[1:] + loop[:1]))
+    for a in extra:
+        if any(abs(a - b) < 1e-12 for b in taken):
+            continue
+        for p, q in edges:
+            hit = _ray_hit(c, a, p, q)
+            if hit is not None:
+                samples.append((a, hit))
+                break
+    samples.sort(key=lambda s: s[0])
+    return samples
+
+
+def _sample_polyline(poly: List[Pt], angles: Sequence[float]) -> List[Pt]:
+    """Origin-star polyline sampled at `angles` (its vertices are returned verbatim)."""
+    own = {_angle(p): p for p in poly}
+    out: List[Pt] = []
+    edges = list(zip(poly, poly[1:]))
+    for a in angles:
+        hit = next((p for b, p in own.items() if abs(a - b) < 1e-9), None)
+        if hit is None:
+            hit = next(h for p, q in edges if (h := _ray_hit((0.0, 0.0), a, p, q)) is not None)
+        out.append(hit)
+    return out
+
+
+def _radial_band(outer: List[Pt], inner: List[Pt]) -> Tuple[List[Pt], List[Pt]]:
+    """Sample two nested origin-star polylines on one shared angle set."""
+    angles = sorted({round(_angle(p), 12) for p in outer + inner})
+    return _sample_polyline(outer, angles), _sample_polyline(inner, angles)
+
+
+def _on_polyline(loop: List[Pt], poly: List[Pt]) -> List[Pt]:
+    """Sub-run of a sampled face boundary lying on `poly`, from its first to last vertex."""
+    start, end = loop.index(poly[0]), loop.index(poly[-1])
+    # Face boundaries are ordered by angle around the hole, so the run may wrap.
+    return loop[start:end + 1] if start <= end else loop[start:] + loop[:end + 1]
+
+
+# ---- Triangle emitters ----
+
+def _xyz(p: Pt, z: float) -> Tuple[float, float, float]:
+    return (p[0], p[1], z)
+
+
+def _band(a: List[Pt], b: List[Pt], za: float, zb: float) -> np.ndarray:
+    """Quad strip between two equally sampled polylines."""
+    tris = []
+    for i in range(len(a) - 1):
+        a0, a1, b0, b1 = _xyz(a[i], za), _xyz(a[i + 1], za), _xyz(b[i], zb), _xyz(b[i + 1], zb)
+        tris.append((a0, a1, b1))
+        tris.append((a0, b1, b0))
+    return np.array(tris, dtype=float).reshape(-1, 3, 3)
+
+
+def _fan(apex: Pt, ring: List[Pt], z: float, *, closed: bool = False) -> np.ndarray:
+    pts = ring + ring[:1] if closed else ring
+    tris = [(_xyz(apex, z), _xyz(pts[i], z), _xyz(pts[i + 1], z)) for i in range(len(pts) - 1)]
+    return np.array(tris, dtype=float).reshape(-1, 3, 3)
+
+
+def _zip(a: List[Pt], za: float, b: List[Pt], zb: float, center: Pt = (0.0, 0.0)) -> np.ndarray:
+    """Triangulate the wall between two samplings of the same polyline.
+
+    Both runs share their corner vertices, so advancing by angle never spans a corner.
+    """
+    ta = [_angle(p, center) for p in a]
+    tb = [_angle(p, center) for p in b]
+    return _zip_params(a, ta, za, b, tb, zb)
+
+
+def _zip_closed(a: List[Pt], za: float, b: List[Pt], zb: float, center: Pt) -> np.ndarray:
+    # Circles all start at angle 0 (part of every sampling); close the loop at 2*pi.
+    ta = [_angle(p, center) for p in a]
+    tb = [_angle(p, center) for p in b]
+    ta[0] = tb[0] = 0.0
+    return _zip_params(a + a[:1], ta + [2 * math.pi], za, b + b[:1], tb + [2 * math.pi], zb)
+
+
+def _zip_params(a: List[Pt], ta: List[float], za: float, b: List[Pt], tb: List[float], zb: float) -> np.ndarray:
+    i = j = 0
+    tris = []
+    while i < len(a) - 1 or j < len(b) - 1:
+        if j == len(b) - 1 or (i < len(a) - 1 and ta[i + 1] <= tb[j + 1]):
+            tris.append((_xyz(a[i], za), _xyz(a[i + 1], za), _xyz(b[j], zb)))
+            i += 1
+        else:
+            tris.append((_xyz(a[i], za), _xyz(b[j + 1], zb), _xyz(b[j], zb)))
+            j += 1
+    return np.array(tris, dtype=float).reshape(-1, 3, 3)
+
+
+def _toward_origin(centroids: np.ndarray) -> np.ndarray:
+    return np.column_stack([-centroids[:, 0], -centroids[:, 1], np.zeros(len(centroids))])
+
+
+def _away_from_origin(centroids: np.ndarray) -> np.ndarray:
+    return -_toward_origin(centroids)
+
+
+def _toward(c: Pt):
+    def direction(centroids: np.ndarray) -> np.ndarray:
+        return np.column_stack([c[0] - centroids[:, 0], c[1] - centroids[:, 1], np.zeros(len(centroids))])
+    return direction
+
+
+def _orient(tris: np.ndarray, outward: Any) -> np.ndarray:
+    """Flip triangles whose winding disagrees with the outward direction."""
+    if not len(tris):
+        return tris
+    normals = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    want = outward(tris.mean(axis=1)) if callable(outward) else np.broadcast_to(outward, normals.shape)
+    flip = np.einsum("ij,ij->i", normals, want) < 0
+    tris[flip] = tris[flip][:, ::-1]
+    return tris
@@ -0,0 +1,62 @@
+import pytest
+
+cg = pytest.importorskip("cad.container_generator")
+
+
+def test_config_is_hashable_and_normalizes_lists():
+    a = cg.ContainerConfig(compartments=[2, 1], circles=[[0, 0, 5]])
+    b = cg.ContainerConfig(compartments=(2, 1), circles=((0, 0, 5),))
+    assert a == b and hash(a) == hash(b)
+    assert a.cache_key() == b.cache_key()
+    assert a.cache_key() != cg.ContainerConfig().cache_key()
+
+
+def test_export_cached_reuses_file(tmp_path):
+    gen = cg.GridfinityContainerGenerator(cg.ContainerConfig(compartments=(2, 1)))
+    first = gen.export_cached(tmp_path)
+    first.write_bytes(b"sentinel")
+    assert gen.export_cached(tmp_path) == first
+    assert first.read_bytes() == b"sentinel"
+    assert [p.name for p in tmp_path.iterdir()] == [first.name]
+
+
+def test_preview_rasterizes_mesh(tmp_path):
+    fast_stl = pytest.importorskip("cad.fast_stl")
+    out = cg.render_preview_png(fast_stl.bin_triangles(cg.ContainerConfig()), tmp_path / "p.png", dpi=50)
+    data = out.read_bytes()
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    assert int.from_bytes(data[16:20], "big") == int.from_bytes(data[20:24], "big") == 200
+
+
+def test_build_many_dedupes_and_keeps_order(tmp_path):
+    a = cg.ContainerConfig()
+    b = cg.ContainerConfig(compartments=(2, 1))
+    paths = cg.build_many([a, b, a], tmp_path, max_workers=2)
+    assert paths[0] == paths[2] != paths[1]
+    assert all(p.stat().st_size > 0 for p in paths)
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted({p.name for p in paths})
+
+
+@pytest.mark.parametrize("kw", [
+    {"compartments": (2, 1)},
+    {"compartments": (3, 3), "lip": True, "magnets": True, "screws": True, "x_slots": 2, "y_slots": 2},
+    {"compartments": (4, 1), "lip": False, "circles": ((0, 0, 8),)},
+])
+def test_glued_compartments_stay_valid(kw):
+    solid = cg.GridfinityContainerGenerator(cg.ContainerConfig(**kw)).build().val()
+    assert solid.isValid()
+    assert len(solid.Solids()) == 1
+
+
+def test_export_cached_survives_concurrent_builders(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    cfg = cg.ContainerConfig(compartments=(2, 1))
+    first = cg.GridfinityContainerGenerator(cfg).build()  # warm the build cache so the race is on the write
+    # Each builder gets its own shape, so the threads never mesh the same OCCT object.
+    assert not first.val().isSame(cg.GridfinityContainerGenerator(cfg).build().val())
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        paths = list(ex.map(lambda _: cg.GridfinityContainerGenerator(cfg).export_cached(tmp_path), range(8)))
+    assert len(set(paths)) == 1
+    assert [p.name for p in tmp_path.iterdir()] == [paths[0].name]
+    assert paths[0].stat().st_size > 0
@@ -0,0 +1,350 @@
+import asyncio
+import time
+
+import diskcache
+import httpx
+
+from app.services.dimensions import fetcher, http_cache, wikidata
+from app.services.dimensions import cache
+from app.services.dimensions.cache import cached_fetch
+from app.services.dimensions.fetcher import _fetch_dimensions
+from app.services.dimensions.http_cache import ValidatorStore, conditional_fetch
+from app.services.dimensions.providers import schema_org
+from app.services.dimensions.parse import normalize_dims_from_text, parse_single
+from app.services.dimensions.types import DimensionsResult
+
+
+def test_normalize_triplet_with_unit():
+    dims = normalize_dims_from_text("152 × 106 × 60 mm")
+    assert dims == {"L": 152.0, "W": 106.0, "H": 60.0}
+
+
+def test_normalize_single_converts_to_mm():
+    dims = normalize_dims_from_text("Height: 2.5 cm")
+    assert dims == {"L": 25.0}
+
+
+def test_normalize_prefers_triplet_over_earlier_single():
+    dims = normalize_dims_from_text("Cable 1.5 m, body 15.2 x 10.6 x 6 cm")
+    assert dims == {"L": 152.0, "W": 106.0, "H": 60.0}
+
+
+def test_parse_single_finds_values_inside_triplets():
+    assert parse_single("10 x 20 x 30 cm") == (30.0, "cm")
+    assert parse_single("weighs 5 kg") is None
+
+
+def test_merge_missing_keeps_higher_confidence():
+    wd = DimensionsResult(dims_mm={"L": 100.0}, source="Wikidata", confidence=0.9)
+    wi = DimensionsResult(dims_mm={"L": 99.0, "W": 50.0}, source="Wikipedia infobox", confidence=0.6)
+    merged = wd.merge_missing(wi)
+    assert merged.dims_mm == {"L": 100.0, "W": 50.0}
+    assert merged.source == "Wikidata"
+
+
+def test_cached_fetch_single_flight():
+    calls = 0
+
+    async def slow_fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "dims"
+
+    async def run():
+        first = await asyncio.gather(*(cached_fetch("k-single-flight", slow_fetch) for _ in range(5)))
+        again = await cached_fetch("k-single-flight", slow_fetch)
+        return first, again
+
+    first, again = asyncio.run(run())
+    assert calls == 1
+    assert [v for v, _ in first] == ["dims"] * 5
+    assert again == ("dims", True)
+
+
+def test_cached_fetch_late_caller_joins_existing_waiters():
+    active = peak = 0
+
+    async def miss():
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return None
+
+    async def late():
+        await asyncio.sleep(0.015)  # first flight done, second still running
+        return await cached_fetch("k-late", miss, cache_if=lambda v: False)
+
+    async def run():
+        await asyncio.gather(*(cached_fetch("k-late", miss, cache_if=lambda v: False) for _ in range(3)), late())
+
+    asyncio.run(run())
+    assert peak == 1
+    assert "k-late" not in cache._LOCKS
+
+
+def test_cached_fetch_skips_rejected_values():
+    calls = 0
+
+    async def miss():
+        nonlocal calls
+        calls += 1
+        return None
+
+    async def run():
+        await cached_fetch("k-miss", miss, cache_if=lambda v: v is not None)
+        return await cached_fetch("k-miss", miss, cache_if=lambda v: v is not None)
+
+    assert asyncio.run(run()) == (None, False)
+    assert calls == 2
+
+
+def test_conditional_fetch_reuses_parse_on_304(tmp_path):
+    store = ValidatorStore(tmp_path / "http_cache.db")
+    parses = 0
+
+    def handler(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, headers={"ETag": '"v1"'}, text="152 x 106 x 60 mm")
+
+    def parse(r):
+        nonlocal parses
+        parses += 1
+        return DimensionsResult(dims_mm=normalize_dims_from_text(r.text), source="test")
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            first = await conditional_fetch(client, "https://example.com/p", parse, store=store)
+            second = await conditional_fetch(client, "https://example.com/p", parse, store=store)
+            return first, second
+
+    first, second = asyncio.run(run())
+    assert parses == 1
+    assert second.dims_mm == first.dims_mm == {"L": 152.0, "W": 106.0, "H": 60.0}
+
+
+def test_conditional_fetch_caps_streamed_body(tmp_path):
+    head = b'<script type="application/ld+json">{"@type": "Product"}</script>'
+    seen = []
+
+    def handler(request):
+        return httpx.Response(200, content=head + b"x" * 1_000_000)
+
+    def parse(r):
+        seen.append(len(r.content))
+        return None
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            await conditional_fetch(
+                client, "https://example.com/p", parse, store=ValidatorStore(tmp_path / "v.db"), max_bytes=1024
+            )
+
+    asyncio.run(run())
+    assert seen == [1024]
+
+
+def test_fetch_dimensions_merges_concurrent_providers(tmp_path, monkeypatch):
+    monkeypatch.setattr(http_cache, "_store", ValidatorStore(tmp_path / "http_cache.db"))
+    monkeypatch.setattr(wikidata, "_disk", diskcache.Cache(str(tmp_path / "wikidata_cache")))
+    mm = "http://www.wikidata.org/entity/Q174789"
+
+    def handler(request):
+        if request.url.host == "www.wikidata.org":
+            return httpx.Response(200, json={"search": [{"id": "Q42"}]})
+        if request.url.host == "query.wikidata.org":
+            rows = [{
+                "prop": {"value": "length"},
+                "amount": {"value": "150"},
+                "unit": {"value": mm},
+                "label": {"value": "Switch Pro Controller"},
+                "enwikiTitle": {"value": "Pro Controller"},
+            }]
+            return httpx.Response(200, json={"results": {"bindings": rows}})
+        if request.url.path == "/wiki/Pro_Controller":
+            html = (
+                '<table class="infobox"><tr><th>Dimensions</th>'
+                "<td>152 × 106 × <b>60</b>&nbsp;mm</td></tr></table>"
+            )
+            return httpx.Response(200, text=html)
+        return httpx.Response(404)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await _fetch_dimensions(None, "pro controller", [], client=client)
+
+    result, qid = asyncio.run(run())
+    assert qid == "Q42"
+    assert result.source == "Wikidata"
+    assert result.dims_mm == {"L": 150.0, "W": 106.0, "H": 60.0}
+
+
+def test_id_lookup_without_wikidata_dims_follows_sitelink(tmp_path, monkeypatch):
+    monkeypatch.setattr(http_cache, "_store", ValidatorStore(tmp_path / "http_cache.db"))
+    monkeypatch.setattr(wikidata, "_disk", diskcache.Cache(str(tmp_path / "wikidata_cache")))
+
+    def handler(request):
+        if request.url.host == "query.wikidata.org":
+            rows = [{"label": {"value": "Pro Controller"}, "enwikiTitle": {"value": "Pro Controller"}}]
+            return httpx.Response(200, json={"results": {"bindings": rows}})
+        if request.url.path == "/wiki/Pro_Controller":
+            html = (
+                '<table class="infobox"><tr><th>Dimensions</th>'
+                "<td>152 × 106 × 60 mm</td></tr></table>"
+            )
+            return httpx.Response(200, text=html)
+        return httpx.Response(404)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await _fetch_dimensions("Q42", None, [], client=client)
+
+    result, qid = asyncio.run(run())
+    assert qid == "Q42"
+    assert result.source == "Wikipedia infobox"
+    assert result.dims_mm == {"L": 152.0, "W": 106.0, "H": 60.0}
+
+
+def test_schema_org_reads_products_from_jsonld_graph():
+    html = """
+    <script type="application/ld+json">
+    {"@graph": [{"@type": "WebPage"},
+                {"@type": "Product", "height": {"value": "6", "unitCode": "CMT"},
+                 "width": {"value": "106", "unitCode": "MMT"}}]}
+    </script>
+    <script type="application/ld+json">{not json</script>
+    """
+    r = httpx.Response(200, text=html, request=httpx.Request("GET", "https://example.com/p"))
+    result = schema_org._parse_response("https://example.com/p", r)
+    assert result.dims_mm == {"H": 60.0, "W": 106.0}
+
+
+def test_fetch_wikidata_served_from_disk_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(wikidata, "_disk", diskcache.Cache(str(tmp_path / "wikidata_cache")))
+    rows = [{"prop": {"value": "height"}, "amount": {"value": "6"},
+             "unit": {"value": "http://www.wikidata.org/entity/Q174728"}}]
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        return httpx.Response(200, json={"results": {"bindings": rows}})
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            await wikidata.fetch_wikidata("Q1", client)
+            return await wikidata.fetch_wikidata("Q1", client)
+
+    result, official, enwiki_title = asyncio.run(run())
+    assert calls == 1
+    assert result.dims_mm == {"H": 60.0}
+    assert official is None and enwiki_title is None
+
+
+def test_fetch_dimensions_dedupes_equivalent_urls(monkeypatch):
+    seen = []
+
+    async def fake_schema_org(url, client):
+        seen.append(url)
+        return DimensionsResult(dims_mm={"L": 1.0}, source="schema.org", source_url=url, confidence=0.9)
+
+    monkeypatch.setattr(fetcher, "fetch_schema_org", fake_schema_org)
+    urls = ["HTTPS://Example.com/p#specs", "https://example.com/p", " https://EXAMPLE.com/p "]
+
+    result, _, _ = asyncio.run(fetcher.fetch_dimensions(None, None, urls, client=None))
+    assert seen == ["https://example.com/p"]
+    assert result.source_url == "https://example.com/p"
+
+
+def test_fetch_dimensions_drops_unparseable_urls(monkeypatch):
+    seen = []
+
+    async def fake_schema_org(url, client):
+        seen.append(url)
+        return None
+
+    async def bad_official(qid, query, client):
+        return "Q1", (None, "http://[bad", None)
+
+    monkeypatch.setattr(fetcher, "fetch_schema_org", fake_schema_org)
+    monkeypatch.setattr(fetcher, "_wikidata", bad_official)
+
+    asyncio.run(fetcher.fetch_dimensions("Q1", None, ["http://[bad/p", "https://example.com/p"], client=None))
+    assert seen == ["https://example.com/p"]
+
+
+def test_high_confidence_box_cancels_slower_providers(monkeypatch):
+    cancelled = []
+
+    async def fast_wikidata(qid, query, client):
+        box = DimensionsResult(dims_mm={"L": 1.0, "W": 2.0, "H": 3.0}, source="Wikidata", confidence=0.9)
+        return qid, (box, None, None)
+
+    async def slow_schema_org(url, client):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(url)
+            raise
+
+    monkeypatch.setattr(fetcher, "_wikidata", fast_wikidata)
+    monkeypatch.setattr(fetcher, "fetch_schema_org", slow_schema_org)
+
+    async def run():
+        return await asyncio.wait_for(_fetch_dimensions("Q1", None, ["https://example.com/p"], client=None), 1)
+
+    result, _ = asyncio.run(run())
+    assert result.source == "Wikidata"
+    assert cancelled == ["https://example.com/p"]
+
+
+def test_validator_store_batches_commits(tmp_path):
+    store = ValidatorStore(tmp_path / "http_cache.db")
+    store.put("https://example.com/a", '"v1"', None, "h", None)
+    reader = ValidatorStore(tmp_path / "http_cache.db")
+    assert store.get("https://example.com/a") is not None  # visible to the writer at once
+    assert reader.get("https://example.com/a") is None  # not committed yet
+    store.flush()
+    assert reader.get("https://example.com/a") == ('"v1"', None, "h", None)
+
+
+def test_validator_store_commits_after_interval(tmp_path, monkeypatch):
+    monkeypatch.setattr(http_cache, "_COMMIT_INTERVAL", 0.05)
+    store = ValidatorStore(tmp_path / "http_cache.db")
+    store.put("https://example.com/a", None, None, "h", None)
+    time.sleep(0.3)
+    assert ValidatorStore(tmp_path / "http_cache.db").get("https://example.com/a") is not None
+
+
+def test_early_exit_still_waits_for_wikidata(monkeypatch):
+    cancelled = []
+
+    async def slow_wikidata(qid, query, client):
+        await asyncio.sleep(0.05)
+        named = DimensionsResult(item_id="Q42", name="Widget", dims_mm={"L": 5.0}, source="Wikidata", confidence=0.8)
+        return "Q42", (named, None, None)
+
+    async def page(url, client):
+        if url.endswith("/slow"):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(url)
+                raise
+        return DimensionsResult(dims_mm={"L": 1.0, "W": 2.0, "H": 3.0}, source="schema.org", source_url=url, confidence=0.9)
+
+    monkeypatch.setattr(fetcher, "_wikidata", slow_wikidata)
+    monkeypatch.setattr(fetcher, "fetch_schema_org", page)
+    urls = ["https://example.com/fast", "https://example.com/slow"]
+
+    async def run():
+        return await asyncio.wait_for(_fetch_dimensions(None, None, urls, client=None), 1)
+
+    result, qid = asyncio.run(run())
+    assert qid == "Q42"
+    assert (result.item_id, result.name) == ("Q42", "Widget")
+    assert result.dims_mm == {"L": 1.0, "W": 2.0, "H": 3.0}
+    assert cancelled == ["https://example.com/slow"]
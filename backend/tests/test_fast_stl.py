@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from cad.fast_stl import STL_DTYPE, bin_triangles, is_simple, read_stl, write_stl
+
+cg = pytest.importorskip("cad.container_generator")
+
+
+def _signed_volume(tris):
+    t = tris.astype(np.float64)
+    return np.einsum("ij,ij->i", t[:, 0], np.cross(t[:, 1], t[:, 2])).sum() / 6
+
+
+def _is_closed(tris):
+    edges = {}
+    for t in tris:
+        for i in range(3):
+            e = (tuple(t[i]), tuple(t[(i + 1) % 3]))
+            edges[e] = edges.get(e, 0) + 1
+    return all(n == 1 and edges.get((b, a)) == 1 for (a, b), n in edges.items())
+
+
+@pytest.mark.parametrize("kw", [
+    {},
+    {"lip": False, "outer_fillet": 0.0},
+    {"magnet_thickness": 1.0, "screws": True},
+    {"magnets": False, "screws": True, "x_slots": 3, "y_slots": 1},
+])
+def test_fast_mesh_is_closed_and_matches_cadquery(kw):
+    cfg = cg.ContainerConfig(**kw)
+    assert is_simple(cfg)
+    tris = bin_triangles(cfg)
+    assert _is_closed(tris)
+    brep = cg.GridfinityContainerGenerator(cfg).build().val().Volume()
+    assert _signed_volume(tris) == pytest.approx(brep, rel=2e-3)
+
+
+def test_feature_bins_are_not_simple():
+    assert not is_simple(cg.ContainerConfig(compartments=(2, 1)))
+    assert not is_simple(cg.ContainerConfig(circles=[(0, 0, 10)]))
+
+
+def test_write_stl_is_binary(tmp_path):
+    tris = bin_triangles(cg.ContainerConfig())
+    out = write_stl(tris, tmp_path / "bin.stl")
+    raw = out.read_bytes()
+    assert int(np.frombuffer(raw[80:84], dtype="<u4")[0]) == len(tris)
+    records = np.frombuffer(raw[84:], dtype=STL_DTYPE)
+    assert np.array_equal(records["vectors"], tris)
+
+
+def test_read_stl_round_trips_binary_and_skips_ascii(tmp_path):
+    tris = bin_triangles(cg.ContainerConfig())
+    assert np.array_equal(read_stl(write_stl(tris, tmp_path / "bin.stl")), tris)
+    ascii_stl = tmp_path / "ascii.stl"
+    ascii_stl.write_text("solid bin\n" + " " * 90 + "\nendsolid bin\n")
+    assert read_stl(ascii_stl) is None
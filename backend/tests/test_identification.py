@@ -0,0 +1,28 @@
+import asyncio
+
+from app.services import identification
+
+
+def test_identify_from_text_memoizes_normalized_input(monkeypatch):
+    monkeypatch.setattr(identification, "diskcache", None)
+    identification._identify_cached.cache_clear()
+    calls = []
+    real = identification._identify
+
+    async def counting(norm):
+        calls.append(norm)
+        return await real(norm)
+
+    monkeypatch.setattr(identification, "_identify", counting)
+
+    async def run():
+        first = await identification.identify_from_text("  Nintendo   Switch Pro ")
+        second = await identification.identify_from_text("nintendo switch pro")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert calls == ["nintendo switch pro"]
+    assert first.candidates[0].id == second.candidates[0].id == "Qnintendo_switch_"
+    # Normalization only keys the cache; callers get their own text back everywhere.
+    assert first.item == first.candidates[0].name == "Nintendo Switch Pro"
+    assert second.item == second.candidates[0].name == "nintendo switch pro"
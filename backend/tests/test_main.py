@@ -0,0 +1,14 @@
+from fastapi.testclient import TestClient
+
+from app import main
+
+
+def test_oversized_upload_rejection_carries_cors_headers():
+    client = TestClient(main.app)
+    resp = client.post(
+        "/identify-image",
+        content=b"x",
+        headers={"Origin": "http://localhost:5173", "Content-Length": str(main.MAX_UPLOAD_BYTES + 1)},
+    )
+    assert resp.status_code == 413
+    assert "access-control-allow-origin" in resp.headers
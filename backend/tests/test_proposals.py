@@ -1,5 +1,5 @@
 from app.services.proposals import generate_proposals
-from app.models import ProposalsRequest, Dimensions
+from app.schemas import ProposalsRequest, Dimensions
 
 
 def test_generate_proposals_monotonic():
@@ -26,3 +26,24 @@ def test_generate_proposals_minimums():
     res = generate_proposals(req)
     for p in res.proposals:
         assert p.x_slots >= 1 and p.y_slots >= 1 and p.z_units >= 1
+
+
+def test_generate_proposals_exact_grid_boundary():
+    # 37.7 + 0.3 clearance + 2 * 2.0 wall is exactly one 42 mm slot
+    req = ProposalsRequest(
+        item_id="Qedge",
+        dims_mm=Dimensions(L=37.7, W=37.7, H=3.7),
+        options={}
+    )
+    snug = generate_proposals(req).proposals[0]
+    assert (snug.x_slots, snug.y_slots, snug.z_units) == (1, 1, 1)
+
+
+def test_proposals_are_hashable():
+    req = ProposalsRequest(
+        item_id="Qtest",
+        dims_mm=Dimensions(L=100, W=80, H=30),
+        options={}
+    )
+    proposals = generate_proposals(req).proposals
+    assert len(set(proposals)) == 3
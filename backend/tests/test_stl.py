@@ -0,0 +1,70 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from app.schemas import Proposal
+from app.services import stl
+
+_PROPOSAL = Proposal(type="snug", x_slots=1, y_slots=1, z_units=3, clearance=0.5)
+
+
+def _slow_exporter(calls):
+    def export(solid, path, exportType):
+        calls.append(path)
+        with open(path, "wb") as fh:
+            fh.write(b"solid")
+            time.sleep(0.05)  # hold the temp file open while the other writers run
+            fh.write(b" bin")
+
+    return SimpleNamespace(exporters=SimpleNamespace(export=export))
+
+
+def test_concurrent_writers_use_private_temp_files(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(stl, "_make_bin", lambda *a: None)
+    monkeypatch.setattr(stl, "_load_cadquery", lambda: _slow_exporter(calls))
+    fp = tmp_path / "bin.stl"
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        list(ex.map(lambda _: stl._build_stl(_PROPOSAL, None, {}, stl.GFParams(), fp), range(4)))
+    assert len(set(calls)) == 4
+    assert [f.name for f in tmp_path.iterdir()] == ["bin.stl"]
+    assert fp.read_bytes() == b"solid bin"
+
+
+def test_identical_inflight_builds_are_deduplicated(tmp_path, monkeypatch):
+    submitted = []
+    release = threading.Event()
+
+    def build(*args):
+        release.wait(5)
+
+    class Pool(ThreadPoolExecutor):
+        def submit(self, fn, *args):
+            submitted.append(args)
+            return super().submit(build, *args)
+
+    pool = Pool(max_workers=2)
+    monkeypatch.setattr(stl, "_pool", lambda: pool)
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        futures = [ex.submit(stl._build_once, "k", _PROPOSAL, None, {}, stl.GFParams(), tmp_path / "k.stl") for _ in range(4)]
+        time.sleep(0.1)
+        release.set()
+        for f in futures:
+            f.result()
+    pool.shutdown()
+    assert len(submitted) == 1
+
+
+def test_shutdown_pool_cancels_queued_builds(monkeypatch):
+    calls = []
+
+    class Pool:
+        def shutdown(self, **kwargs):
+            calls.append(kwargs)
+
+    monkeypatch.setattr(stl, "_POOL", Pool())
+    stl.shutdown_pool()
+    stl.shutdown_pool()  # idempotent once the pool is gone
+    assert calls == [{"wait": False, "cancel_futures": True}]
+    assert stl._POOL is None
@@ -1,48 +1,179 @@
+import asyncio
+import contextlib
+import functools
+import hashlib
+import logging
+import multiprocessing
 import os
-import uuid
+import tempfile
 import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
 from fastapi import FastAPI, Query
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, ORJSONResponse
+from pydantic import BaseModel, Field
 import cadquery as cq
 
-app = FastAPI()
 TEMP_DIR = "temp_files"
+FILE_TTL = 300  # seconds a generated file stays downloadable
+SWEEP_INTERVAL = 60
+MAX_BATCH = 64
 os.makedirs(TEMP_DIR, exist_ok=True)
+logger = logging.getLogger(__name__)
+
+def _mtimes() -> list[tuple[float, str]]:
+    found = []
+    with os.scandir(TEMP_DIR) as entries:
+        for entry in entries:
+            with contextlib.suppress(FileNotFoundError):  # /download may expire it first
+                if entry.is_file():
+                    found.append((entry.stat().st_mtime, entry.path))  # one stat per file
+    return found
 
 def cleanup_temp_files():
     """Delete files older than 5 minutes in TEMP_DIR."""
-    now = time.time()
-    for filename in os.listdir(TEMP_DIR):
-        path = os.path.join(TEMP_DIR, filename)
-        if os.path.isfile(path) and now - os.path.getmtime(path) > 300:
+    cutoff = time.time() - FILE_TTL
+    # Oldest first: the first live file means everything after it is live too.
+    for mtime, path in sorted(_mtimes()):
+        if mtime > cutoff:
+            break
+        with contextlib.suppress(FileNotFoundError):
             os.remove(path)
 
+_executor: ProcessPoolExecutor | None = None
+
+def _pool() -> ProcessPoolExecutor:
+    # Why: OCCT builds are CPU-bound; separate processes let concurrent requests use every core.
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+async def _sweep_forever():
+    while True:
+        await asyncio.sleep(SWEEP_INTERVAL)
+        # Why: one failed sweep (permissions, a vanished TEMP_DIR) must not end the task for good.
+        try:
+            await asyncio.to_thread(cleanup_temp_files)
+        except Exception:
+            logger.exception("temp file sweep failed")
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Why: sweeping in the background keeps the directory scan off the request path.
+    sweeper = asyncio.create_task(_sweep_forever())
+    try:
+        yield
+    finally:
+        sweeper.cancel()
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
+
+MEDIA_TYPES = {"stl": "model/stl", "step": "model/step"}
+
+def _token(width: int, length: int, height: int) -> str:
+    # Same parameters -> same token, so repeat requests reuse the exported file.
+    return hashlib.blake2b(f"{width}x{length}x{height}".encode(), digest_size=8).hexdigest()
+
+STL_TOLERANCE = 0.2  # mm chordal deviation; plenty for FDM
+STL_ANGULAR_TOLERANCE = 0.3
+
+@functools.lru_cache(maxsize=32)
+def _box(width: int, length: int, height: int) -> cq.Workplane:
+    # Example: a simple parametric box (replace with actual Gridfinity logic)
+    return cq.Workplane("XY").box(width, length, height)
+
+def _build_and_export(width: int, length: int, height: int, ext: str, file_path: str) -> None:
+    """Build the box and export it to `file_path`; runs in a worker process."""
+    result = _box(width, length, height)
+    # Why: a private temp file per writer; a shared ".part" path lets identical
+    # concurrent builds clobber each other and lose the rename race.
+    fd, part_path = tempfile.mkstemp(dir=os.path.dirname(file_path) or ".", suffix=".part")
+    os.close(fd)
+    try:
+        _export(result, ext, part_path)
+        try:
+            os.replace(part_path, file_path)  # readers never see a half-written file
+        except OSError:
+            if not os.path.exists(file_path):  # an identical build already landed it
+                raise
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(part_path)
+
+def _export(result: cq.Workplane, ext: str, part_path: str) -> None:
+    if ext == "stl":
+        # Why: OCCT's default deflection meshes far finer than a printer can resolve.
+        cq.exporters.export(
+            result, part_path, exportType="STL",
+            tolerance=STL_TOLERANCE, angularTolerance=STL_ANGULAR_TOLERANCE,
+        )
+    else:
+        cq.exporters.export(result, part_path, exportType="STEP")  # exact BRep, no meshing
+
+async def _ensure_file(width: int, length: int, height: int, ext: str) -> tuple[str, str]:
+    """Return (token, path) for the box, building it in the worker pool if needed."""
+    token = _token(width, length, height)
+    file_path = os.path.join(TEMP_DIR, f"{token}.{ext}")
+    if os.path.exists(file_path):
+        os.utime(file_path)  # keep hot files clear of the 5-minute cleanup
+    else:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(_pool(), _build_and_export, width, length, height, ext, file_path)
+    return token, file_path
+
 @app.get("/generate")
-def generate_container(width: int = Query(42, gt=0), length: int = Query(42, gt=0), height: int = Query(20, gt=0), filetype: str = Query("stl", pattern="^(stl|step)$")):
+async def generate_container(width: int = Query(42, gt=0), length: int = Query(42, gt=0), height: int = Query(20, gt=0), filetype: str = Query("stl", pattern="^(stl|step)$"), download: bool = Query(False)):
     """
     Generate a Gridfinity-style box and return a download URL.
     Parameters: width (mm), length (mm), height (mm), filetype ('stl' or 'step')
+    With download=true the file itself is returned, skipping the /download round-trip.
     """
-    cleanup_temp_files()
-    token = str(uuid.uuid4())
     ext = "step" if filetype == "step" else "stl"
-    file_path = os.path.join(TEMP_DIR, f"{token}.{ext}")
+    token, file_path = await _ensure_file(width, length, height, ext)
+    if download:
+        return FileResponse(
+            file_path,
+            media_type=MEDIA_TYPES[ext],
+            filename=f"gridfinity_container_{token}.{ext}",
+        )
+    return {"download_url": f"/download/{token}?filetype={ext}"}
 
-    # Example: a simple parametric box (replace with actual Gridfinity logic)
-    result = cq.Workplane("XY").box(width, length, height)
-    if ext == "stl":
-        cq.exporters.export(result, file_path)
-    else:
-        cq.exporters.export(result, file_path)
+class BoxSpec(BaseModel):
+    width: int = Field(42, gt=0)
+    length: int = Field(42, gt=0)
+    height: int = Field(20, gt=0)
+    filetype: str = Field("stl", pattern="^(stl|step)$")
 
-    return {"download_url": f"/download/{token}?filetype={ext}"}
+@app.post("/generate_batch")
+async def generate_batch(specs: List[BoxSpec]):
+    """
+    Generate several boxes at once from a JSON array of {width, length, height, filetype}.
+    Returns one download URL per entry, in request order.
+    """
+    if len(specs) > MAX_BATCH:
+        return ORJSONResponse({"error": f"At most {MAX_BATCH} boxes per batch."}, status_code=413)
+    # Why: fan the builds out across the pool at once; identical entries share one build.
+    jobs = {}
+    for spec in specs:
+        key = (spec.width, spec.length, spec.height, spec.filetype)
+        if key not in jobs:
+            jobs[key] = asyncio.ensure_future(_ensure_file(*key))
+    await asyncio.gather(*jobs.values())
+    urls = []
+    for spec in specs:
+        token, _ = jobs[(spec.width, spec.length, spec.height, spec.filetype)].result()
+        urls.append({"download_url": f"/download/{token}?filetype={spec.filetype}"})
+    return urls
 
 @app.get("/download/{token}")
 def download_file(token: str, filetype: str = Query("stl", pattern="^(stl|step)$")):
     file_path = os.path.join(TEMP_DIR, f"{token}.{filetype}")
     if not os.path.exists(file_path):
-        return JSONResponse({"error": "File not found or expired."}, status_code=404)
-    if time.time() - os.path.getmtime(file_path) > 300:
+        return ORJSONResponse({"error": "File not found or expired."}, status_code=404)
+    if time.time() - os.path.getmtime(file_path) > FILE_TTL:
         os.remove(file_path)
-        return JSONResponse({"error": "File expired."}, status_code=410)
+        return ORJSONResponse({"error": "File expired."}, status_code=410)
     return FileResponse(file_path, filename=f"gridfinity_container_{token}.{filetype}")